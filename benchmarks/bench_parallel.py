@@ -0,0 +1,51 @@
+"""Compare sequential and process-pool document ingestion.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_parallel --pdf-dir data/input/PDFs --workers 4
+"""
+import argparse
+import glob
+import os
+import time
+from src.document_processor import DocumentProcessor
+from src.models import ProcessingOptions
+
+def run_once(document_paths, num_workers: int, persona: str, job: str, repeat: int):
+    """Return (best wall time, analysis) for the given worker count."""
+    timings = []
+    with DocumentProcessor(ProcessingOptions(num_workers=num_workers)) as processor:
+        # Warm-up run so worker start-up and spaCy loading are not timed
+        processor.process_documents(document_paths, persona, job)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            analysis = processor.process_documents(document_paths, persona, job)
+            timings.append(time.perf_counter() - start)
+    return min(timings), analysis
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf-dir", default=os.path.join("data", "input", "PDFs"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--persona", default="Travel Planner")
+    parser.add_argument("--job", default="Plan a trip of 4 days for a group of 10 college friends.")
+    args = parser.parse_args()
+
+    document_paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    if not document_paths:
+        parser.error(f"No PDF files found in {args.pdf_dir}")
+
+    sequential_time, sequential = run_once(document_paths, 1, args.persona, args.job, args.repeat)
+    parallel_time, parallel = run_once(document_paths, args.workers, args.persona, args.job, args.repeat)
+
+    identical = (sequential.extracted_sections == parallel.extracted_sections and
+                 sequential.subsection_analysis == parallel.subsection_analysis)
+
+    print(f"documents: {len(document_paths)}")
+    print(f"1 worker:  {sequential_time:.3f}s")
+    print(f"{args.workers} workers: {parallel_time:.3f}s (speedup {sequential_time / parallel_time:.2f}x)")
+    print(f"identical output: {identical}")
+
+if __name__ == "__main__":
+    main()
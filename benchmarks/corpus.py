@@ -0,0 +1,83 @@
+"""Generate synthetic PDF collections for benchmarking.
+
+Usage (from the repository root):
+
+    python -m benchmarks.corpus --out-dir /tmp/corpus --documents 20 --pages 50
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from typing import List
+import fitz  # PyMuPDF
+
+# Travel-guide flavoured vocabulary so titles hit ranking keywords and pages contain named entities
+PLACES = ["Nice", "Marseille", "Avignon", "Toulouse", "Montpellier", "Cannes", "Arles", "Carcassonne",
+          "Provence", "Monaco", "Nimes", "Antibes", "Perpignan", "Aix-en-Provence", "Saint-Tropez"]
+TITLE_WORDS = ["Guide", "Tour", "Trip", "Travel", "History", "Cuisine", "Markets", "Festivals",
+               "Beaches", "Museums", "Nightlife", "Hotels", "Restaurants", "Wine", "Adventure",
+               "Experience", "Planning", "Tips", "Culture", "Architecture"]
+BODY_WORDS = ["the", "a", "of", "and", "to", "in", "visitors", "can", "enjoy", "local", "old", "town",
+              "streets", "food", "views", "coast", "sea", "summer", "friends", "group", "days",
+              "evening", "morning", "walk", "famous", "small", "village", "price", "season", "route"]
+
+@dataclass
+class CorpusSpec:
+    documents: int = 7
+    pages: int = 10
+    # Fraction of lines on a page written as candidate titles
+    title_density: float = 0.15
+    lines_per_page: int = 40
+    seed: int = 0
+
+def _body_line(rng: random.Random) -> str:
+    words = [rng.choice(BODY_WORDS) for _ in range(rng.randint(8, 14))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), rng.choice(PLACES))
+    return " ".join(words) + "."
+
+def _title_line(rng: random.Random) -> str:
+    return f"{rng.choice(TITLE_WORDS)} {rng.choice(['in', 'of', 'around'])} {rng.choice(PLACES)}"
+
+def generate_corpus(out_dir: str, spec: CorpusSpec) -> List[str]:
+    """Write spec.documents synthetic PDFs to out_dir and return their paths.
+
+    The same spec always produces the same text, so runs are comparable.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(spec.seed)
+    paths = []
+    for doc_index in range(spec.documents):
+        pdf = fitz.open()
+        for _ in range(spec.pages):
+            page = pdf.new_page()
+            lines = [
+                _title_line(rng) if rng.random() < spec.title_density else _body_line(rng)
+                for _ in range(spec.lines_per_page)
+            ]
+            y = 40
+            for line in lines:
+                page.insert_text((40, y), line, fontsize=9)
+                y += 18
+        path = os.path.join(out_dir, f"synthetic_{doc_index:04d}.pdf")
+        pdf.save(path)
+        pdf.close()
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--documents", type=int, default=CorpusSpec.documents)
+    parser.add_argument("--pages", type=int, default=CorpusSpec.pages)
+    parser.add_argument("--title-density", type=float, default=CorpusSpec.title_density)
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(documents=args.documents, pages=args.pages,
+                      title_density=args.title_density, seed=args.seed)
+    paths = generate_corpus(args.out_dir, spec)
+    print(f"Wrote {len(paths)} PDFs ({spec.documents * spec.pages} pages) to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
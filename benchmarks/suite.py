@@ -0,0 +1,173 @@
+"""Reproducible throughput, latency and memory benchmarks against a stored baseline.
+
+Usage (from the repository root):
+
+    python -m benchmarks.suite --save-baseline           # record benchmarks/baseline.json
+    python -m benchmarks.suite                           # compare against it
+    python -m benchmarks.suite --scenarios small large --tolerance 0.1
+
+Each scenario generates a synthetic corpus (see benchmarks.corpus) and is
+measured in a fresh process, so peak RSS figures are not polluted by earlier
+scenarios. The exit status is 1 when any metric regresses beyond the
+tolerance.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+SCENARIOS = {
+    "small": CorpusSpec(documents=7, pages=10),
+    "medium": CorpusSpec(documents=20, pages=50),
+    "large": CorpusSpec(documents=50, pages=100, title_density=0.3),
+}
+
+PERSONA = "Travel Planner"
+JOB = "Plan a trip of 4 days for a group of 10 college friends."
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Metrics where larger values are better; everything else is a cost
+HIGHER_IS_BETTER = {"pages_per_second"}
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_scenario(name: str, repeat: int) -> Dict[str, float]:
+    """Measure one scenario; runs in its own process."""
+    from src.document_processor import DocumentProcessor
+    from src.models import ProcessingOptions
+    from src.sections import SectionTable
+    from src.profiling import peak_rss_kb
+    from src.utils import save_analysis_to_json
+
+    spec = SCENARIOS[name]
+    with tempfile.TemporaryDirectory() as work_dir:
+        paths = generate_corpus(os.path.join(work_dir, "pdfs"), spec)
+        total_pages = spec.documents * spec.pages
+
+        start = time.perf_counter()
+        processor = DocumentProcessor()
+        processor.load_models()
+        metrics = {"startup_seconds": time.perf_counter() - start}
+
+        analysis = None
+        def process():
+            nonlocal analysis
+            analysis = processor.process_documents(paths, PERSONA, JOB)
+        metrics["process_documents_seconds"] = _best_of(repeat, process)
+        metrics["pages_per_second"] = total_pages / metrics["process_documents_seconds"]
+        for stage, stats in processor.profiler.report()["stages"].items():
+            metrics[f"stage_{stage}_seconds"] = stats["wall_seconds"]
+
+        # Individual stages
+        metrics["process_single_document_seconds"] = _best_of(
+            repeat, lambda: processor._process_single_document(paths[0])
+        )
+        sections, pages = processor._extract_document(paths[0])
+        metrics["is_relevant_page_seconds"] = _best_of(
+            repeat, lambda: processor._is_relevant_page(pages[0][1])
+        )
+        all_sections = SectionTable()
+        for path in paths:
+            all_sections.extend(processor._extract_document(path)[0])
+        metrics["candidate_sections"] = len(all_sections)
+        metrics["rank_sections_seconds"] = _best_of(
+            repeat, lambda: processor._rank_sections(all_sections, PERSONA, JOB)
+        )
+        bm25_processor = DocumentProcessor(ProcessingOptions(ranking="bm25"))
+        metrics["rank_sections_bm25_seconds"] = _best_of(
+            repeat, lambda: bm25_processor._rank_sections(all_sections, PERSONA, JOB, top_k=5)
+        )
+        output_path = os.path.join(work_dir, "analysis_output.json")
+        metrics["save_analysis_to_json_seconds"] = _best_of(
+            repeat, lambda: save_analysis_to_json(analysis, output_path)
+        )
+
+        metrics["peak_rss_kb"] = peak_rss_kb() or 0
+    return metrics
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_seconds: float = 0.0) -> int:
+    """Print a comparison table and return the number of regressions.
+
+    Timings below min_seconds in both runs are treated as noise.
+    """
+    regressions = 0
+    for scenario, metrics in results.items():
+        print(f"\n[{scenario}]")
+        base = baseline.get(scenario, {})
+        for metric, value in sorted(metrics.items()):
+            if metric not in base or not base[metric]:
+                print(f"  {metric:45s} {value:14.4f}   (no baseline)")
+                continue
+            change = (value - base[metric]) / base[metric]
+            if metric in HIGHER_IS_BETTER:
+                regressed = change < -tolerance
+            elif metric.endswith("_seconds"):
+                regressed = change > tolerance and max(value, base[metric]) >= min_seconds
+            elif metric.endswith("_kb"):
+                regressed = change > tolerance
+            else:
+                # Counts such as candidate_sections are context, not performance
+                regressed = False
+            regressions += regressed
+            flag = "REGRESSION" if regressed else ""
+            print(f"  {metric:45s} {value:14.4f} {change:+8.1%}  {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Relative change tolerated before a metric counts as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="Ignore timing changes when both runs are faster than this")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenarios:
+        # A fresh process per scenario keeps peak RSS measurements independent
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(run_scenario, name, args.repeat).result()
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        compare(results, {}, args.tolerance)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+
+    regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+    if regressions:
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        raise SystemExit(1)
+    print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import tempfile
+from concurrent.futures import as_completed
+from dataclasses import replace, asdict
+from typing import List, Optional, Tuple
+from . import workers
+from .config_loader import ConfigLoader
+from .models import BatchJob, BatchJobResult, DocumentAnalysis, ProcessingOptions
+from .utils import save_analysis_to_json
+
+SUMMARY_FILENAME = "batch_summary.json"
+
+def load_jobs(source: str, output_dir: str, default_pdf_dir: str) -> List[BatchJob]:
+    """Build the job list from a directory of input configs or a manifest file.
+
+    A directory contributes one job per *.json file, written to
+    <output_dir>/<name>_output.json. A manifest is a JSON list of objects with
+    an "input" path and optional "output" and "pdf_dir" paths; relative paths
+    are resolved against the manifest's directory.
+    """
+    if os.path.isdir(source):
+        return [
+            BatchJob(
+                input_path=os.path.join(source, name),
+                output_path=os.path.join(output_dir, f"{os.path.splitext(name)[0]}_output.json"),
+                pdf_dir=default_pdf_dir
+            )
+            for name in sorted(os.listdir(source))
+            if name.lower().endswith('.json')
+        ]
+
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise Exception(f"Batch manifest not found: {source}")
+    except json.JSONDecodeError:
+        raise Exception(f"Invalid JSON format in batch manifest: {source}")
+    if not isinstance(manifest, list):
+        raise Exception(f"Batch manifest must be a list of jobs: {source}")
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    jobs = []
+    for entry in manifest:
+        input_path = os.path.join(base_dir, entry["input"])
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        jobs.append(BatchJob(
+            input_path=input_path,
+            output_path=os.path.join(base_dir, entry["output"]) if "output" in entry
+            else os.path.join(output_dir, f"{name}_output.json"),
+            pdf_dir=os.path.join(base_dir, entry["pdf_dir"]) if "pdf_dir" in entry else default_pdf_dir
+        ))
+    return jobs
+
+def _run_job(document_paths: List[str], persona: str, job_to_be_done: str) -> Tuple[DocumentAnalysis, float]:
+    # Runs in a worker; timed there so queueing time is not counted
+    start = time.perf_counter()
+    analysis = workers.analyse_documents(document_paths, persona, job_to_be_done)
+    return analysis, time.perf_counter() - start
+
+def run_batch(jobs: List[BatchJob], options: Optional[ProcessingOptions] = None, max_workers: int = 1,
+              summary_path: Optional[str] = None) -> List[BatchJobResult]:
+    """Run many analyses in one invocation and return one result per job.
+
+    Models are loaded once per worker process and each distinct PDF is
+    extracted once: a priming pass fills the extraction cache (a temporary
+    one unless options.cache_dir is set) and every job then reads from it.
+    A failing job is recorded and the batch carries on; so is every job
+    using a document that could not be extracted.
+    """
+    options = options or ProcessingOptions()
+    batch_start = time.perf_counter()
+    results = {}
+    runnable = []
+
+    # Validate every job up front so bad configs fail fast and cheaply
+    for index, job in enumerate(jobs):
+        try:
+            config = ConfigLoader.load_input_config(job.input_path)
+            pdf_files = [os.path.join(job.pdf_dir, doc.filename) for doc in config.documents]
+            for pdf_file in pdf_files:
+                if not os.path.exists(pdf_file):
+                    raise Exception(f"PDF file not found: {pdf_file}")
+            runnable.append((index, job, config, pdf_files))
+        except Exception as e:
+            results[index] = BatchJobResult(job.input_path, job.output_path, False, 0.0, str(e))
+
+    distinct_documents = list(dict.fromkeys(path for _, _, _, pdf_files in runnable for path in pdf_files))
+
+    with tempfile.TemporaryDirectory() as temp_cache_dir:
+        if not options.cache_dir:
+            # Evicting from the batch's own cache would mean extracting documents again
+            options = replace(options, cache_dir=temp_cache_dir, cache_max_bytes=sys.maxsize)
+
+        pool = workers.create_pool(options, max_workers)
+        try:
+            # Extract every distinct PDF exactly once, in parallel
+            failed_documents = {}
+            priming = {}
+            for path in distinct_documents:
+                try:
+                    priming[pool.submit(workers.prime_document, path)] = path
+                except Exception as e:
+                    failed_documents[path] = str(e)
+            for future in as_completed(priming):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed_documents[priming[future]] = str(e)
+
+            futures = {}
+            for index, job, config, pdf_files in runnable:
+                failed = [path for path in pdf_files if path in failed_documents]
+                try:
+                    if failed:
+                        raise Exception(f"Could not extract {failed[0]}: {failed_documents[failed[0]]}")
+                    futures[pool.submit(_run_job, pdf_files, config.persona.role, config.job_to_be_done.task)] = index
+                except Exception as e:
+                    results[index] = BatchJobResult(job.input_path, job.output_path, False, 0.0, str(e))
+            for future in as_completed(futures):
+                index = futures[future]
+                job = jobs[index]
+                try:
+                    analysis, seconds = future.result()
+                    os.makedirs(os.path.dirname(os.path.abspath(job.output_path)), exist_ok=True)
+                    save_analysis_to_json(analysis, job.output_path, top_k=options.top_k)
+                    results[index] = BatchJobResult(job.input_path, job.output_path, True, seconds)
+                except Exception as e:
+                    results[index] = BatchJobResult(job.input_path, job.output_path, False, 0.0, str(e))
+        finally:
+            pool.shutdown()
+
+    ordered = [results[index] for index in range(len(jobs))]
+    if summary_path:
+        summary = {
+            "jobs": len(ordered),
+            "succeeded": sum(1 for result in ordered if result.succeeded),
+            "failed": sum(1 for result in ordered if not result.succeeded),
+            "distinct_documents": len(distinct_documents),
+            "total_seconds": time.perf_counter() - batch_start,
+            "results": [asdict(result) for result in ordered]
+        }
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=4)
+    return ordered
@@ -0,0 +1,213 @@
+import os
+import json
+import hashlib
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from .models import DocumentAnalysis
+
+# Bump when the layout of cached entries changes
+CACHE_FORMAT_VERSION = 1
+
+def sha256_file(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Write JSON to a temporary file and rename it, so concurrent readers never see partial files."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ExtractionCache:
+    """Persistent on-disk cache of per-document extraction results.
+
+    Entries are JSON files named after a key derived from the PDF's content
+    hash and a namespace (library/model versions and extraction settings), so
+    renamed or copied files still hit and upgraded dependencies miss. The
+    directory is bounded by max_bytes; the least recently used entries are
+    evicted first, using file modification times as the access clock.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def file_hash(self, path: str, data: Optional[bytes] = None) -> str:
+        """Return the SHA-256 of a file, memoized on its path, size and mtime.
+
+        data, if given, is the file's content already in memory (e.g.
+        prefetched) and is hashed instead of reading the file again.
+        """
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._hashes.get(memo_key)
+        if digest is None:
+            if data is not None and len(data) == stat.st_size:
+                digest = hashlib.sha256(data).hexdigest()
+            else:
+                digest = sha256_file(path)
+            self._hashes[memo_key] = digest
+        return digest
+
+    def key(self, path: str, namespace: str, data: Optional[bytes] = None) -> str:
+        """Return the cache key of a document for the given namespace."""
+        material = f"{CACHE_FORMAT_VERSION}|{namespace}|{self.file_hash(path, data)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._entry_path(key))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Reading an entry makes it the most recently used one
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        write_json_atomic(self._entry_path(key), entry)
+        self._evict()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if not item.name.endswith('.json'):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def normalize_query(text: str) -> str:
+    """Collapse case and whitespace, which do not change keyword extraction or ranking."""
+    return ' '.join(text.lower().split())
+
+def _analysis_bytes(analysis: DocumentAnalysis) -> int:
+    """Rough memory footprint of an analysis: its strings plus a fixed per-object overhead."""
+    size = 200
+    for section in analysis.extracted_sections:
+        size += 100 + len(section.document) + len(section.section_title)
+    for subsection in analysis.subsection_analysis:
+        size += 100 + len(subsection.document) + len(subsection.refined_text)
+    return size
+
+class ResultCache:
+    """In-memory LRU cache of finished analyses for repeated queries.
+
+    Keys combine each document's name and content hash with the normalized
+    persona, job and top_k. Content hashes are memoized on size and mtime, so
+    a lookup costs one stat per document. When a document's content changes,
+    entries computed from its old content are dropped. The cache holds at
+    most max_entries analyses and roughly max_bytes of text.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[DocumentAnalysis, int, FrozenSet[str]]]" = OrderedDict()
+        # Absolute path -> (size, mtime_ns, sha256)
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        memo = self._digests.get(path)
+        if memo is not None and memo[:2] == (stat.st_size, stat.st_mtime_ns):
+            return memo[2]
+        digest = sha256_file(path)
+        if memo is not None and memo[2] != digest:
+            self._invalidate(memo[2])
+        self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def key(self, paths: List[str], persona: str, job: str, top_k: int) -> Tuple[str, FrozenSet[str]]:
+        """Return the key of a query and the content hashes it depends on."""
+        digests = [self._file_hash(path) for path in paths]
+        material = json.dumps([[os.path.basename(path) for path in paths], digests,
+                               normalize_query(persona), normalize_query(job), top_k])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest(), frozenset(digests)
+
+    def get(self, key: str) -> Optional[DocumentAnalysis]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, digests: FrozenSet[str], analysis: DocumentAnalysis) -> None:
+        size = _analysis_bytes(analysis)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (analysis, size, digests)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def _invalidate(self, digest: str) -> None:
+        """Drop the entries computed from a document content that has since changed."""
+        for key in [key for key, (_, _, digests) in self._entries.items() if digest in digests]:
+            self._remove(key)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
\ No newline at end of file
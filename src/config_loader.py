@@ -5,6 +5,12 @@ import dacite
 from .models import InputConfig
 
 class ConfigLoader:
+    @staticmethod
+    def parse_input_config(data: Dict[str, Any]) -> InputConfig:
+        """Parse an already decoded input configuration."""
+        # Use dacite to convert dictionary to InputConfig dataclass
+        return dacite.from_dict(data_class=InputConfig, data=data)
+    
     @staticmethod
     def load_input_config(input_json_path: str) -> InputConfig:
         """Load and parse the input JSON configuration file."""
@@ -12,9 +18,7 @@ class ConfigLoader:
             with open(input_json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # Use dacite to convert dictionary to InputConfig dataclass
-            config = dacite.from_dict(data_class=InputConfig, data=data)
-            return config
+            return ConfigLoader.parse_input_config(data)
             
         except FileNotFoundError:
             raise Exception(f"Input configuration file not found: {input_json_path}")
@@ -0,0 +1,95 @@
+import hashlib
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Texts whose estimated shingle Jaccard similarity reaches this are near-duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+def normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct crc32 hashes of the word size-grams of a normalized text."""
+    words = text.split()
+    if len(words) <= size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+class MinHasher:
+    """MinHash signatures over 32-bit shingle hashes, with fixed seeds so signatures are stable across runs."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # Coefficients below 2**32 keep a * x + b within uint64
+        self.a = rng.randint(1, 1 << 32, size=(num_permutations, 1), dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=(num_permutations, 1), dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        return ((self.a * hashes[np.newaxis, :] + self.b) % _MERSENNE_PRIME).min(axis=1)
+
+class DuplicateIndex:
+    """Finds exact and near-duplicates of each added text among the texts added before it.
+
+    Exact duplicates are found by content hash. Near-duplicates are found
+    by locality-sensitive hashing of MinHash signatures (banding), and the
+    candidates are confirmed by their estimated Jaccard similarity.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, num_permutations: int = NUM_PERMUTATIONS,
+                 bands: int = LSH_BANDS):
+        if num_permutations % bands:
+            raise Exception(f"{num_permutations} permutations cannot be split into {bands} bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = MinHasher(num_permutations)
+        self._exact: Dict[bytes, Hashable] = {}
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = {}
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Register text under key; return the key of the earliest text it duplicates, if any.
+
+        Duplicates are not registered themselves. Blank texts are never duplicates.
+        """
+        normalized = normalize(text)
+        if not normalized:
+            return None
+        digest = hashlib.sha1(normalized.encode('utf-8')).digest()
+        original = self._exact.get(digest)
+        if original is not None:
+            return original
+
+        signature = self.hasher.signature(shingles(normalized))
+        band_keys = [(band, rows.tobytes()) for band, rows in enumerate(np.split(signature, self.bands))]
+        candidates = {candidate for band_key in band_keys for candidate in self._buckets.get(band_key, ())}
+        for candidate in sorted(candidates, key=self._order.__getitem__):
+            if np.mean(self._signatures[candidate] == signature) >= self.threshold:
+                return candidate
+
+        self._exact[digest] = key
+        self._signatures[key] = signature
+        self._order[key] = len(self._order)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, []).append(key)
+        return None
+
+def unique_indices(titles: Iterable[str]) -> List[int]:
+    """Indices of the first occurrence of each title, ignoring case and whitespace."""
+    seen = set()
+    indices = []
+    for i, title in enumerate(titles):
+        key = normalize(title)
+        if key not in seen:
+            seen.add(key)
+            indices.append(i)
+    return indices
\ No newline at end of file
@@ -1,16 +1,120 @@
 import os
-import fitz  # PyMuPDF
-from typing import List, Dict
-import spacy
+import math
+import mmap
+import cProfile
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Iterable, Iterator, Set, Tuple
 from datetime import datetime
-from .models import Metadata, ExtractedSection, SubsectionAnalysis, DocumentAnalysis
+from .models import Metadata, ExtractedSection, SubsectionAnalysis, DocumentAnalysis, ProcessingOptions
+from .cache import ExtractionCache, ResultCache
+from .dedup import DuplicateIndex, unique_indices
+from .prefetch import Prefetcher
+from .refinement import extractive_summary, query_terms
+from .profiling import Profiler
+from .relevance import create_relevance_backend
+from . import layout
+from .scheduling import EXTRACTION_BUDGET_SHARE, NER_PRIORITY_SHARE, Deadline
+from .sections import SectionTable
+from . import workers
+from .ranking import (LexicalIndex, SectionIndex, TopK, keyword_count, query_keywords, rank_key, section_score,
+                      section_scores, top_k_indices, top_k_sections)
+
+RANKING_METHODS = ("keyword", "bm25")
+HEADING_DETECTORS = ("text", "layout")
+REFINEMENT_METHODS = ("page", "extractive")
+# Files smaller than split_pages_threshold times this many bytes are not opened to count their
+# pages: they are either short or so light that splitting them would not pay off
+MIN_SPLIT_BYTES_PER_PAGE = 1024
+# Cleared once PyMuPDF rejects a memoryview stream, after which PDFs are opened by path
+_memoryview_streams = True
+
+def _text_flags() -> int:
+    """get_text flags: plain text, no image or style bookkeeping, ligatures kept as in the PDF.
+
+    These are the PyMuPDF defaults the output was built against; newer
+    releases add unknown-glyph CID handling, which we do not need.
+    """
+    import fitz  # PyMuPDF
+    return fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
 
 class DocumentProcessor:
-    def __init__(self):
-        # Load a smaller spaCy model to stay within size constraints
-        self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, options: Optional[ProcessingOptions] = None):
+        self.options = options or ProcessingOptions()
+        if self.options.ranking not in RANKING_METHODS:
+            raise Exception(f"Unknown ranking method: {self.options.ranking}")
+        if self.options.ranking == "bm25" and self.options.streaming:
+            raise Exception("BM25 ranking needs corpus-wide statistics and is not supported in streaming mode")
+        if self.options.heading_detection not in HEADING_DETECTORS:
+            raise Exception(f"Unknown heading detection: {self.options.heading_detection}")
+        if self.options.heading_detection == "layout" and self.options.streaming:
+            raise Exception("Layout heading detection needs whole-document font statistics and is not supported in streaming mode")
+        if self.options.refinement not in REFINEMENT_METHODS:
+            raise Exception(f"Unknown refinement method: {self.options.refinement}")
+        if self.options.dedup and self.options.streaming:
+            raise Exception("Duplicate detection keeps a signature per page and is not supported in streaming mode")
+        self._executor = None
+        # Timings and counters of the most recent process_documents call
+        self.profiler = Profiler()
+        # Page relevance detector; models are loaded on first use (or by load_models)
+        self.relevance = create_relevance_backend(self.options)
+        
+        # Optional persistent cache of extracted text, titles and relevance flags
+        self.cache = None
+        self._cache_namespace = None
+        # Time budget of the running process_documents call, if any
+        self._deadline: Optional[Deadline] = None
+        # Background reader of upcoming documents during sequential extraction
+        self._prefetcher: Optional[Prefetcher] = None
+        if self.options.cache_dir:
+            self.cache = ExtractionCache(self.options.cache_dir, self.options.cache_max_bytes)
+        # Optional in-memory cache of finished analyses for repeated queries
+        self.results = None
+        if self.options.result_cache_entries > 0:
+            self.results = ResultCache(self.options.result_cache_entries, self.options.result_cache_max_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def load_models(self):
+        """Load the relevance backend's models now instead of on the first relevance check."""
+        self.relevance.load()
+
+    def close(self):
+        """Shut down the ingestion worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+    def process_documents(self, document_paths: List[str], persona: str, job_to_be_done: str,
+                          top_k: Optional[int] = None) -> DocumentAnalysis:
+        top_k = self.options.top_k if top_k is None else top_k
+        self.profiler.reset()
+        result_key = None
+        if self.results is not None:
+            try:
+                with self.profiler.stage("result_cache"):
+                    result_key, digests = self.results.key(document_paths, persona, job_to_be_done, top_k)
+                    cached = self.results.get(result_key)
+            except OSError:
+                # Unreadable documents are reported by the extraction below
+                cached = None
+            if cached is not None:
+                self.profiler.count("result_cache_hits")
+                return self._reuse_analysis(cached, document_paths, persona, job_to_be_done)
+            self.profiler.count("result_cache_misses")
+        
+        profile = None
+        if self.options.cprofile_path:
+            profile = cProfile.Profile()
+            profile.enable()
+        if self.options.time_budget is not None:
+            self._deadline = Deadline(self.options.time_budget)
         
-    def process_documents(self, document_paths: List[str], persona: str, job_to_be_done: str) -> DocumentAnalysis:
         # Process metadata
         metadata = Metadata(
             input_documents=[os.path.basename(path) for path in document_paths],
@@ -19,112 +123,764 @@ class DocumentProcessor:
             processing_timestamp=datetime.now()
         )
         
-        # Process all documents
-        sections = []
-        subsections = []
+        try:
+            if self.options.streaming:
+                ranked_sections, subsections = self._stream_documents(document_paths, persona, job_to_be_done, top_k)
+            else:
+                # Process all documents
+                keywords = None
+                if self._deadline is not None:
+                    keywords = query_keywords(persona, job_to_be_done, word_boundary=self.options.word_boundary_matching)
+                sections, selected_pages, pages = self._analyse_documents(document_paths, top_k, keywords)
+                # Only the pages that reach the output are refined
+                subsections = self._refine_pages(selected_pages[:top_k], self._refinement_terms(persona, job_to_be_done))
+                
+                # Rank sections by importance
+                with self.profiler.stage("rank_sections"):
+                    bodies = None
+                    if sections.bodies is not None:
+                        bodies = sections.bodies
+                    elif pages is not None and self._uses_section_bodies():
+                        bodies = self._section_bodies(pages)
+                    ranked_sections = self._rank_sections(sections, persona, job_to_be_done, top_k=top_k,
+                                                          bodies=bodies)
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(self.options.cprofile_path)
+            deadline, self._deadline = self._deadline, None
         
-        for doc_path in document_paths:
-            doc_sections, doc_subsections = self._process_single_document(doc_path)
+        metadata.partial = deadline is not None and deadline.partial
+        analysis = DocumentAnalysis(
+            metadata=metadata,
+            extracted_sections=ranked_sections[:top_k], 
+            subsection_analysis=subsections[:top_k]  
+        )
+        # Partial results and failed documents are recomputed next time
+        if result_key is not None and not metadata.partial and not self.profiler.errors:
+            self.results.put(result_key, digests, self._reuse_analysis(analysis, document_paths, persona, job_to_be_done))
+        return analysis
+    
+    def _reuse_analysis(self, analysis: DocumentAnalysis, document_paths: List[str], persona: str,
+                        job_to_be_done: str) -> DocumentAnalysis:
+        """Copy an analysis for another equivalent query, with fresh metadata."""
+        return DocumentAnalysis(
+            metadata=Metadata(
+                input_documents=[os.path.basename(path) for path in document_paths],
+                persona=persona,
+                job_to_be_done=job_to_be_done,
+                processing_timestamp=datetime.now()
+            ),
+            extracted_sections=list(analysis.extracted_sections),
+            subsection_analysis=list(analysis.subsection_analysis)
+        )
+    
+    def _analyse_documents(self, document_paths: List[str], top_k: int, keywords: Optional[Set[str]] = None) -> Tuple[
+            SectionTable, List[Tuple[str, int, str]], Optional[List[Tuple[str, int, str]]]]:
+        """Extract sections, relevant (doc_path, page_number, text) pages and page texts from every document.
+
+        Results are merged in the order of document_paths, so the output is
+        identical whether documents are processed sequentially or by workers.
+        With lazy_relevance enabled, NER stops once the first top_k relevant
+        pages (the only ones that reach the output) are known. Page texts are
+        None when workers ran the whole pipeline and never sent them back.
+        
+        Under a time budget, extraction stops at its share of the budget and
+        NER switches to the pages matching most query keywords first when
+        time gets short (see _scheduled_relevance).
+        """
+        sections = SectionTable()
+        selected_pages = []
+        tasks = [self._document_tasks(doc_path) for doc_path in document_paths]
+        parallel = self.options.num_workers > 1 and len(document_paths) > 1
+        split = any(len(doc_tasks) > 1 for doc_tasks in tasks)
+        
+        if (parallel and not split and not self.options.lazy_relevance and not self._uses_section_bodies() and
+                self._deadline is None and not self.options.dedup):
+            # Workers run the whole per-document pipeline, NER included
+            results = self._get_executor().map(workers.process_document, document_paths)
+            for doc_sections, doc_selected_pages in self._merge_worker_stats(results):
+                sections.extend(doc_sections)
+                selected_pages.extend(doc_selected_pages)
+            return sections, selected_pages, None
+        
+        extracted = self._extract_documents(document_paths, tasks)
+        
+        # Extract text from every document first, then check relevance in one batched NER pass
+        pages = []
+        for done, (doc_path, (doc_sections, doc_pages)) in enumerate(zip(document_paths, extracted), start=1):
             sections.extend(doc_sections)
-            subsections.extend(doc_subsections)
+            pages.extend((doc_path, page_number, text) for page_number, text in doc_pages)
+            if done < len(document_paths) and self._out_of_time():
+                self.profiler.count("documents_skipped", len(document_paths) - done)
+                break
+        extracted.close()
         
-        # Rank sections by importance
-        ranked_sections = self._rank_sections(sections, persona, job_to_be_done)
+        unique_pages = pages
+        if self.options.dedup:
+            sections, unique_pages = self._deduplicate(sections, pages)
         
-        return DocumentAnalysis(
-            metadata=metadata,
-            extracted_sections=ranked_sections[:5], 
-            subsection_analysis=subsections[:5]  
+        limit = top_k if self.options.lazy_relevance else None
+        relevance = None
+        if self._deadline is not None:
+            relevance = self._scheduled_relevance(unique_pages, limit, keywords or set())
+        selected_pages = self._select_relevant_pages(unique_pages, limit, relevance=relevance)
+        return sections, selected_pages, pages
+    
+    def _deduplicate(self, sections: SectionTable, pages: List[Tuple[str, int, str]]) -> Tuple[
+            SectionTable, List[Tuple[str, int, str]]]:
+        """Collapse repeated section titles and (near-)duplicate pages, keeping first occurrences.
+
+        Returns the collapsed sections and the pages left for relevance
+        checks. A duplicate page would get the same relevance as its original,
+        which already competes for the output, so it is never run through NER.
+        BM25 bodies are attached first so they stay aligned with their titles.
+        """
+        with self.profiler.stage("dedup"):
+            if sections.bodies is None and self._uses_section_bodies():
+                sections.bodies = self._section_bodies(pages)
+            index = DuplicateIndex()
+            unique_pages = [page for i, page in enumerate(pages) if index.add(i, self._refine_text(page[2])) is None]
+            keep = unique_indices(sections.titles())
+            duplicate_sections = len(sections) - len(keep)
+            if duplicate_sections:
+                sections = sections.take(keep)
+        self.profiler.count("duplicate_pages", len(pages) - len(unique_pages))
+        self.profiler.count("duplicate_sections", duplicate_sections)
+        return sections, unique_pages
+    
+    def _out_of_time(self, doc_path: Optional[str] = None) -> bool:
+        """Whether extraction has used up its share of the time budget.
+
+        Only called with work left, which is then skipped: the analysis is
+        marked partial and doc_path, if given, as cut short.
+        """
+        if self._deadline is None or not self._deadline.expired(EXTRACTION_BUDGET_SHARE):
+            return False
+        self._deadline.partial = True
+        if doc_path is not None:
+            self._deadline.cut_short.add(doc_path)
+        return True
+    
+    def _cut_short(self, doc_path: str) -> bool:
+        return self._deadline is not None and doc_path in self._deadline.cut_short
+    
+    def _scheduled_relevance(self, pages: List[Tuple[str, int, str]], limit: Optional[int],
+                             keywords: Set[str]) -> Iterator[bool]:
+        """Yield the relevance of each page in page order, checking the most promising pages first near the deadline.
+
+        NER runs lazily in page order, as without a budget, until the answer
+        is settled (the first limit relevant pages in page order are known)
+        or NER_PRIORITY_SHARE of the budget is used. The remaining time goes
+        to the unchecked pages matching most query keywords, until limit
+        relevant pages are known or the budget runs out. Pages left
+        unchecked count as not relevant and make the result partial.
+        """
+        flags: List[Optional[bool]] = [None] * len(pages)
+        # Pages before frontier all have known flags; found of them are relevant
+        frontier = found = 0
+        relevance = self._page_relevance(pages)
+        try:
+            while frontier < len(pages) and (limit is None or found < limit):
+                if self._deadline.expired(NER_PRIORITY_SHARE):
+                    break
+                flags[frontier] = next(relevance)
+                found += flags[frontier]
+                frontier += 1
+        finally:
+            relevance.close()
+        
+        if frontier < len(pages) and (limit is None or found < limit):
+            word_boundary = self.options.word_boundary_matching
+            with self.profiler.stage("prefilter"):
+                matches = {i: keyword_count(pages[i][2], keywords, word_boundary) for i in range(frontier, len(pages))}
+            order = sorted(matches, key=lambda i: -matches[i])
+            relevance = self._page_relevance([pages[i] for i in order])
+            try:
+                for i in order:
+                    if (limit is not None and found >= limit) or self._deadline.expired():
+                        break
+                    flags[i] = next(relevance)
+                    found += flags[i]
+            finally:
+                relevance.close()
+            
+            # Unchecked pages only matter before the limit-th relevant page
+            known = 0
+            for flag in flags:
+                if flag is None:
+                    self._deadline.partial = True
+                    self.profiler.count("pages_unchecked", flags.count(None))
+                    break
+                known += flag
+                if limit is not None and known >= limit:
+                    break
+        for flag in flags:
+            yield flag is True
+    
+    def _merge_worker_stats(self, results):
+        """Yield worker results, folding the profiler snapshots and cut-short documents sent along with them into ours."""
+        for result, snapshot, cut_short in results:
+            self.profiler.merge(snapshot)
+            if cut_short:
+                self._deadline.partial = True
+                self._deadline.cut_short.update(cut_short)
+            yield result
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Workers only run NER when they run the whole per-document pipeline (see
+            # _analyse_documents); each then loads its own spaCy pipeline once
+            self._executor = workers.create_pool(self.options, self.options.num_workers,
+                                                 warm=not self.options.lazy_relevance)
+        return self._executor
+    
+    def _extract_documents(self, document_paths: List[str], tasks: Optional[List[List[Tuple[str, int, Optional[int]]]]] = None
+                           ) -> Iterator[Tuple[SectionTable, List[Tuple[int, str]]]]:
+        """Yield the extraction results of each document in order, using the worker pool if enabled.
+
+        Documents above split_pages_threshold pages are extracted as page
+        ranges by several workers and reassembled in page order, so the
+        results are the same as extracting them whole.
+        """
+        if tasks is None:
+            tasks = [self._document_tasks(doc_path) for doc_path in document_paths]
+        flat_tasks = [task for doc_tasks in tasks for task in doc_tasks]
+        futures = []
+        if self.options.num_workers > 1 and len(flat_tasks) > 1:
+            # Workers stop at the same deadline as we do
+            deadline = self._deadline.wall_clock() if self._deadline is not None else None
+            executor = self._get_executor()
+            futures = [executor.submit(workers.extract_task, task, deadline) for task in flat_tasks]
+            results = self._merge_worker_stats(future.result() for future in futures)
+            prefetching = self._prefetching([])
+        else:
+            results = (self._extract_task(task) for task in flat_tasks)
+            prefetching = self._prefetching(document_paths)
+        
+        try:
+            with prefetching:
+                for doc_path, doc_tasks in zip(document_paths, tasks):
+                    if len(doc_tasks) == 1:
+                        yield next(results)
+                        continue
+                    sections = SectionTable()
+                    pages = []
+                    for _ in doc_tasks:
+                        range_sections, range_pages = next(results)
+                        sections.extend(range_sections)
+                        pages.extend(range_pages)
+                    if (self.cache is not None and not any(error["document"] == doc_path for error in self.profiler.errors) and
+                            not self._cut_short(doc_path)):
+                        self.cache.put(self._cache_key(doc_path), self._cache_entry(sections, pages))
+                    yield sections, pages
+        finally:
+            # Tasks not started yet are dropped when the caller stops early, e.g. out of time
+            for future in futures:
+                future.cancel()
+    
+    @contextmanager
+    def _prefetching(self, document_paths: List[str]):
+        """Read the bytes of document_paths ahead of their extraction while the block runs, if enabled."""
+        if self.options.prefetch_depth <= 0 or not document_paths or self._prefetcher is not None:
+            yield
+            return
+        self._prefetcher = Prefetcher(document_paths, self.options.prefetch_depth, self.options.prefetch_max_bytes)
+        try:
+            yield
+        finally:
+            self._prefetcher.close()
+            self._prefetcher = None
+    
+    def _document_tasks(self, doc_path: str) -> List[Tuple[str, int, Optional[int]]]:
+        """Split a document into (doc_path, start, stop) page ranges; stop None means the whole document.
+
+        Only files large enough to have more than split_pages_threshold pages
+        of text are opened (here, in the parent) to count their pages.
+        """
+        whole = [(doc_path, 0, None)]
+        threshold = self.options.split_pages_threshold
+        # Layout headings depend on the body font size of the whole document
+        if self.options.num_workers <= 1 or threshold <= 0 or self.options.heading_detection == "layout":
+            return whole
+        try:
+            if os.path.getsize(doc_path) < threshold * MIN_SPLIT_BYTES_PER_PAGE:
+                return whole
+            if self.cache is not None and self.cache.contains(self._cache_key(doc_path)):
+                return whole
+            with self.profiler.stage("open_pdf", doc_path):
+                doc = self._open_pdf(doc_path)
+                page_count = len(doc)
+                doc.close()
+        except Exception:
+            # Let the worker report the error
+            return whole
+        if page_count <= threshold:
+            return whole
+        size = math.ceil(page_count / self.options.num_workers)
+        return [(doc_path, start, min(start + size, page_count)) for start in range(0, page_count, size)]
+    
+    def _extract_task(self, task: Tuple[str, int, Optional[int]]) -> Tuple[SectionTable, List[Tuple[int, str]]]:
+        doc_path, start, stop = task
+        if stop is None:
+            return self._extract_document(doc_path)
+        return self._extract_pages(doc_path, start, stop)
+    
+    def _process_single_document(self, doc_path: str) -> Tuple[List[ExtractedSection], List[SubsectionAnalysis]]:
+        sections, selected_pages = self._process_document(doc_path)
+        return list(sections), self._refine_pages(selected_pages)
+    
+    def _process_document(self, doc_path: str) -> Tuple[SectionTable, List[Tuple[str, int, str]]]:
+        """Return the candidate sections and the relevant (doc_path, page_number, text) pages of a PDF."""
+        sections, pages = self._extract_document(doc_path)
+        selected_pages = self._select_relevant_pages(
+            (doc_path, page_number, text) for page_number, text in pages
         )
+        return sections, selected_pages
     
-    def _process_single_document(self, doc_path: str):
-        sections = []
-        subsections = []
+    def _extract_document(self, doc_path: str) -> Tuple[SectionTable, List[Tuple[int, str]]]:
+        """Return the candidate sections and (page_number, text) pairs of a PDF."""
+        sections = SectionTable()
+        pages = []
         
         try:
-            doc = fitz.open(doc_path)
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                
-                # Extract sections using text analysis
-                page_sections = self._extract_sections(text, doc_path, page_num + 1)
-                sections.extend(page_sections)
-                
-                # Extract detailed content for subsection analysis
-                if self._is_relevant_page(text):
-                    subsections.append(
-                        SubsectionAnalysis(
-                            document=doc_path.split('/')[-1],
-                            refined_text=self._refine_text(text),
-                            page_number=page_num + 1
-                        )
-                    )
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self._cache_key(doc_path)
+                with self.profiler.stage("cache_lookup", doc_path):
+                    entry = self.cache.get(cache_key)
+                if entry is not None:
+                    return self._from_cache_entry(doc_path, entry)
             
-            doc.close()
+            self._collect_pages(doc_path, sections, pages)
+            
+            # Documents cut short by the time budget are not cached
+            if cache_key is not None and not self._cut_short(doc_path):
+                self.cache.put(cache_key, self._cache_entry(sections, pages))
         except Exception as e:
             print(f"Error processing document {doc_path}: {str(e)}")
+            self.profiler.error(str(e), doc_path)
             
-        return sections, subsections
+        return sections, pages
     
-    def _extract_sections(self, text: str, doc_path: str, page_num: int) -> List[ExtractedSection]:
-        sections = []
-        # Simple section extraction based on line breaks and text formatting
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if self._is_section_title(line):
-                sections.append(
-                    ExtractedSection(
-                        document=doc_path.split('/')[-1],
-                        section_title=line.strip(),
-                        importance_rank=0,  # Will be updated later
-                        page_number=page_num
-                    )
+    def _extract_pages(self, doc_path: str, start: int, stop: int) -> Tuple[SectionTable, List[Tuple[int, str]]]:
+        """Return the candidate sections and (page_number, text) pairs of pages start..stop-1 (0-based) of a PDF."""
+        sections = SectionTable()
+        pages = []
+        try:
+            self._collect_pages(doc_path, sections, pages, start, stop)
+        except Exception as e:
+            print(f"Error processing document {doc_path}: {str(e)}")
+            self.profiler.error(str(e), doc_path)
+        return sections, pages
+    
+    def _collect_pages(self, doc_path: str, sections: SectionTable, pages: List[Tuple[int, str]],
+                       start: int = 0, stop: Optional[int] = None):
+        document = doc_path.split('/')[-1]
+        if self.options.heading_detection == "layout":
+            self._collect_layout_pages(doc_path, sections, pages, start, stop)
+            return
+        for page_number, text in self._read_pages(doc_path, start, stop):
+            # Extract sections using text analysis
+            for title in self._section_titles(text, doc_path):
+                sections.append(document, page_number, title)
+            pages.append((page_number, text))
+    
+    def _collect_layout_pages(self, doc_path: str, sections: SectionTable, pages: List[Tuple[int, str]],
+                              start: int = 0, stop: Optional[int] = None):
+        """Detect headings from span font metrics in one get_text("dict") pass per page.
+
+        Page text is rebuilt from the same lines, so it matches get_text().
+        """
+        document = doc_path.split('/')[-1]
+        page_lines = []
+        for page_number, page_dict in self._read_pages(doc_path, start, stop, output="dict"):
+            lines = layout.page_lines(page_dict)
+            page_lines.append((page_number, lines))
+            pages.append((page_number, layout.page_text(lines)))
+        with self.profiler.stage("extract_sections", doc_path):
+            headings = layout.detect_headings(page_lines)
+        for page_number, title, body in headings:
+            sections.append(document, page_number, title, body)
+        self.profiler.count("candidate_sections", len(headings), document=doc_path)
+    
+    def _read_pages(self, doc_path: str, start: int = 0, stop: Optional[int] = None,
+                    output: str = "text") -> Iterator[Tuple[int, object]]:
+        """Yield (page_number, text) for each page of a PDF (or of a page range), one page at a time.
+
+        output is passed to page.get_text; "dict" yields the page's blocks, lines and spans instead.
+        """
+        with self.profiler.stage("open_pdf", doc_path):
+            doc = self._open_pdf(doc_path)
+        try:
+            flags = _text_flags()
+            stop = len(doc) if stop is None else min(stop, len(doc))
+            for page_num in range(start, stop):
+                if self._out_of_time(doc_path):
+                    self.profiler.count("pages_skipped", stop - page_num, document=doc_path)
+                    break
+                with self.profiler.stage("get_text", doc_path):
+                    page = doc.load_page(page_num)
+                    text = page.get_text(output, flags=flags)
+                self.profiler.count("pages", document=doc_path)
+                yield page_num + 1, text
+        finally:
+            doc.close()
+    
+    def _open_pdf(self, doc_path: str):
+        import fitz  # PyMuPDF
+        if self._prefetcher is not None:
+            data = self._prefetcher.take(doc_path)
+            if data is not None:
+                self.profiler.count("prefetch_hits", document=doc_path)
+                return fitz.open(stream=data, filetype="pdf")
+        global _memoryview_streams
+        if not self.options.mmap_pdfs or not _memoryview_streams:
+            return fitz.open(doc_path)
+        try:
+            with open(doc_path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty and special files cannot be mapped
+            return fitz.open(doc_path)
+        view = memoryview(buffer)
+        try:
+            return fitz.open(stream=view, filetype="pdf")
+        except (TypeError, ValueError):
+            # Older PyMuPDF releases (including the pinned 1.21.1) only accept bytes streams.
+            # Opening by path avoids holding a copy of the whole file for the extraction
+            _memoryview_streams = False
+            view.release()
+            buffer.close()
+            return fitz.open(doc_path)
+    
+    def _iter_pages(self, document_paths: List[str]) -> Iterator[Tuple[str, int, str, List[ExtractedSection]]]:
+        """Yield (doc_path, page_number, text, candidate sections) for every page of every document."""
+        with self._prefetching(document_paths):
+            for doc_path in document_paths:
+                if self._out_of_time():
+                    break
+                if self.cache is not None:
+                    # Cached documents are loaded whole, so memory is bounded by the largest document
+                    sections, pages = self._extract_document(doc_path)
+                    sections_by_page = defaultdict(list)
+                    for section in sections:
+                        sections_by_page[section.page_number].append(section)
+                    for page_number, text in pages:
+                        yield doc_path, page_number, text, sections_by_page[page_number]
+                    continue
+                
+                try:
+                    for page_number, text in self._read_pages(doc_path):
+                        yield doc_path, page_number, text, self._extract_sections(text, doc_path, page_number)
+                except Exception as e:
+                    print(f"Error processing document {doc_path}: {str(e)}")
+                    self.profiler.error(str(e), doc_path)
+    
+    def _stream_documents(self, document_paths: List[str], persona: str, job_to_be_done: str,
+                          top_k: int) -> Tuple[List[ExtractedSection], List[SubsectionAnalysis]]:
+        """Rank sections and select subsections in a single pass with bounded memory.
+
+        Pages flow through extraction, title detection and relevance checks
+        into bounded top-k accumulators. Memory depends on top_k and the NER
+        batch size, not on the number of pages. Results match the default
+        pipeline: the position bias uses the same global section order.
+        """
+        word_boundary = self.options.word_boundary_matching
+        keywords = query_keywords(persona, job_to_be_done, word_boundary=word_boundary)
+        top_sections = TopK(top_k)
+        selected_pages = []
+        pending = []
+        position = 0
+        
+        for doc_path, page_number, text, page_sections in self._iter_pages(document_paths):
+            with self.profiler.stage("rank_sections"):
+                for section in page_sections:
+                    count = keyword_count(section.section_title, keywords, word_boundary)
+                    section.importance_rank = section_score(count, position)
+                    top_sections.push(section)
+                    position += 1
+            
+            # Buffer at most one NER batch of pages until top_k relevant pages are found
+            if len(selected_pages) < top_k:
+                pending.append((doc_path, page_number, text))
+                if len(pending) >= self.options.nlp_batch_size:
+                    selected_pages.extend(self._select_relevant_pages(pending, top_k - len(selected_pages)))
+                    pending = []
+        
+        if pending and len(selected_pages) < top_k:
+            selected_pages.extend(self._select_relevant_pages(pending, top_k - len(selected_pages)))
+        
+        subsections = self._refine_pages(selected_pages, self._refinement_terms(persona, job_to_be_done))
+        return top_sections.items(), subsections
+    
+    def _select_relevant_pages(self, pages: Iterable[Tuple[str, int, str]], limit: Optional[int] = None,
+                               relevance: Optional[Iterator[bool]] = None) -> List[Tuple[str, int, str]]:
+        """Return the relevant pages among (doc_path, page_number, text) triples, in order.
+
+        When limit is given, relevance checking stops as soon as that many
+        relevant pages have been found. relevance is a generator of per-page
+        flags (default: _page_relevance) and is closed afterwards.
+        """
+        pages = list(pages)
+        selected = []
+        if limit is not None and limit <= 0:
+            return selected
+        
+        if relevance is None:
+            relevance = self._page_relevance(pages)
+        try:
+            for page, relevant in zip(pages, relevance):
+                if relevant:
+                    selected.append(page)
+                    if limit is not None and len(selected) >= limit:
+                        break
+        finally:
+            relevance.close()
+        return selected
+    
+    def _refinement_terms(self, persona: str, job: str) -> Optional[Set[str]]:
+        """Query terms for extractive refinement; None refines whole pages."""
+        if self.options.refinement != "extractive":
+            return None
+        return query_terms(query_keywords(persona, job, word_boundary=True))
+    
+    def _refine_pages(self, pages: Iterable[Tuple[str, int, str]],
+                      terms: Optional[Set[str]] = None) -> List[SubsectionAnalysis]:
+        """Turn selected (doc_path, page_number, text) pages into subsections.
+
+        Without terms the refined text is the whole page; with them it is the
+        page's best matching sentences, bounded by refined_max_chars.
+        """
+        subsections = []
+        for doc_path, page_number, text in pages:
+            # Extract detailed content for subsection analysis
+            with self.profiler.stage("refine_text", doc_path):
+                refined_text = self._refine_text(text)
+                if terms is not None:
+                    refined_text = extractive_summary(refined_text, terms, self.options.refined_max_chars)
+            subsections.append(
+                SubsectionAnalysis(
+                    document=doc_path.split('/')[-1],
+                    refined_text=refined_text,
+                    page_number=page_number
                 )
-        return sections
+            )
+        return subsections
+    
+    def _page_relevance(self, pages: List[Tuple[str, int, str]]) -> Iterator[bool]:
+        """Yield the relevance of each page, reusing flags from the extraction cache.
+
+        Only pages without a cached flag are run through NER; newly computed
+        flags are written back when the generator is closed.
+        """
+        if self.cache is None:
+            yield from self._relevant_pages(text for _, _, text in pages)
+            return
+        
+        flags = {}
+        for doc_path, _, _ in pages:
+            if doc_path not in flags:
+                flags[doc_path] = self.cache.get(self._relevance_key(doc_path)) or {}
+        known = [flags[doc_path].get(str(page_number)) for doc_path, page_number, _ in pages]
+        computed = self._relevant_pages(
+            text for (_, _, text), flag in zip(pages, known) if flag is None
+        )
+        
+        updated = set()
+        try:
+            for (doc_path, page_number, _), flag in zip(pages, known):
+                if flag is None:
+                    flag = next(computed)
+                    flags[doc_path][str(page_number)] = flag
+                    updated.add(doc_path)
+                yield flag
+        finally:
+            for doc_path in updated:
+                self.cache.put(self._relevance_key(doc_path), flags[doc_path])
+    
+    def extraction_namespace(self) -> str:
+        """Identify the extraction and relevance code, so stored results can be invalidated."""
+        if self._cache_namespace is None:
+            import fitz  # PyMuPDF
+            self._cache_namespace = (f"pymupdf={fitz.VersionBind}|text_flags={_text_flags()}|"
+                                     f"headings={self.options.heading_detection}|{self.relevance.version()}")
+        return self._cache_namespace
+    
+    def _cache_entry(self, sections: SectionTable, pages: List[Tuple[int, str]]) -> Dict:
+        return {
+            "pages": [text for _, text in pages],
+            "sections": self._section_rows(sections)
+        }
+    
+    @staticmethod
+    def _section_rows(sections: SectionTable) -> List[List]:
+        """Serialize a document's sections as [page_number, title] (or [page_number, title, body]) rows."""
+        if sections.bodies is None:
+            return [[page_number, title] for _, page_number, title in sections.rows()]
+        return [[page_number, title, body] for (_, page_number, title), body in zip(sections.rows(), sections.bodies)]
+    
+    def _cache_key(self, doc_path: str) -> str:
+        # Hash prefetched bytes rather than reading the file a second time
+        data = self._prefetcher.peek(doc_path) if self._prefetcher is not None else None
+        return self.cache.key(doc_path, self.extraction_namespace(), data)
+    
+    def _relevance_key(self, doc_path: str) -> str:
+        return f"{self._cache_key(doc_path)}-relevance"
+    
+    def _from_cache_entry(self, doc_path: str, entry: Dict) -> Tuple[SectionTable, List[Tuple[int, str]]]:
+        document = doc_path.split('/')[-1]
+        sections = SectionTable.from_rows(
+            (document, *row) for row in entry["sections"]
+        )
+        pages = list(enumerate(entry["pages"], start=1))
+        self.profiler.count("cache_hits", document=doc_path)
+        self.profiler.count("pages", len(pages), document=doc_path)
+        self.profiler.count("candidate_sections", len(sections), document=doc_path)
+        return sections, pages
+    
+    def _extract_sections(self, text: str, doc_path: str, page_num: int) -> List[ExtractedSection]:
+        return [
+            ExtractedSection(
+                document=doc_path.split('/')[-1],
+                section_title=title,
+                importance_rank=0,  # Will be updated later
+                page_number=page_num
+            )
+            for title in self._section_titles(text, doc_path)
+        ]
+    
+    def _section_titles(self, text: str, doc_path: str) -> List[str]:
+        titles = []
+        with self.profiler.stage("extract_sections", doc_path):
+            # Simple section extraction based on line breaks and text formatting
+            lines = text.split('\n')
+            for line in lines:
+                if self._is_section_title(line):
+                    titles.append(line.strip())
+        self.profiler.count("candidate_sections", len(titles), document=doc_path)
+        return titles
+    
+    def _uses_section_bodies(self) -> bool:
+        return self.options.ranking == "bm25" and self.options.bm25_body_weight > 0
+    
+    def _section_bodies(self, pages: Iterable[Tuple[str, int, str]]) -> List[str]:
+        """Return the text beneath each candidate section title, in extraction order.
+
+        A body runs from its title to the next title or the end of the page.
+        """
+        bodies = []
+        for _, _, text in pages:
+            body = None
+            for line in text.split('\n'):
+                if self._is_section_title(line):
+                    if body is not None:
+                        bodies.append(' '.join(body))
+                    body = []
+                elif body is not None and line.strip():
+                    body.append(line.strip())
+            if body is not None:
+                bodies.append(' '.join(body))
+        return bodies
     
     def _is_section_title(self, text: str) -> bool:
         # Simple heuristic for section titles
-        return (len(text.strip()) > 0 and
-                len(text.strip()) < 100 and
-                text.strip()[0].isupper() and
-                not text.strip().endswith('.'))
+        text = text.strip()
+        return (len(text) > 0 and
+                len(text) < 100 and
+                text[0].isupper() and
+                not text.endswith('.'))
     
     def _is_relevant_page(self, text: str) -> bool:
         # Implement relevance checking logic
-        doc = self.nlp(text)
-        return len(doc.ents) > 0  # Simple check for named entities
+        return next(self._relevant_pages([text]))
+    
+    def _relevant_pages(self, texts: Iterable[str]) -> Iterator[bool]:
+        """Lazily yield the relevance of each page from the relevance backend (spaCy NER streams in batches)."""
+        flags = self.relevance.relevant_pages(texts)
+        while True:
+            with self.profiler.stage("relevance_ner"):
+                relevant = next(flags, None)
+            if relevant is None:
+                return
+            self.profiler.count("ner_pages")
+            yield relevant
     
     def _refine_text(self, text: str) -> str:
         # Clean and refine the text
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = [line for line in (raw.strip() for raw in text.split('\n')) if line]
         return ' '.join(lines)
     
-    def _rank_sections(self, sections: List[ExtractedSection], persona: str, job: str) -> List[ExtractedSection]:
-        """Rank sections based on relevance to persona and job."""
-        # Convert persona and job to lowercase for matching
-        persona_lower = persona.lower()
-        job_lower = job.lower()
+    def _rank_sections(self, sections, persona: str, job: str,
+                       index=None, top_k: Optional[int] = None,
+                       bodies: Optional[List[str]] = None) -> List[ExtractedSection]:
+        """Rank sections based on relevance to persona and job.
+
+        sections is a list of ExtractedSection or a SectionTable; for a table
+        scores are computed as arrays and only the returned sections are
+        materialized. Titles are looked up through an inverted SectionIndex
+        (or scored with a LexicalIndex in BM25 mode); pass one built over the
+        same sections to reuse it across several persona/job queries. With
+        top_k, only the k best sections are selected instead of sorting the
+        whole list.
+        """
+        if self.options.ranking == "bm25":
+            return self._rank_sections_bm25(sections, persona, job, index, top_k, bodies)
+        
+        if isinstance(sections, SectionTable):
+            titles = list(sections.titles())
+            if index is None:
+                index = SectionIndex(titles, word_boundary=self.options.word_boundary_matching)
+            keywords = query_keywords(persona, job, word_boundary=index.word_boundary)
+            scores = section_scores(index.keyword_counts(keywords))
+            return self._select_sections(sections, scores, titles, top_k)
         
-        # Define relevant keywords based on persona and job
-        keywords = set(persona_lower.split() + job_lower.split())
+        if index is None:
+            index = SectionIndex(
+                (section.section_title for section in sections),
+                word_boundary=self.options.word_boundary_matching
+            )
         
-        # Add task-specific keywords
-        task_keywords = {'travel', 'tour', 'trip', 'plan', 'guide', 'experience', 'adventure'}
-        keywords.update(task_keywords)
+        # Define relevant keywords based on persona, job and the travel task
+        keywords = query_keywords(persona, job, word_boundary=index.word_boundary)
+        keyword_counts = index.keyword_counts(keywords)
         
         # Score sections based on keyword matches and position
-        for i, section in enumerate(sections):
-            title_lower = section.section_title.lower()
-            
-            # Calculate base score from keyword matches
-            keyword_score = sum(2 for keyword in keywords if keyword in title_lower)
-            
-            # Add position bias (earlier sections get slightly higher score)
-            position_score = 1.0 / (i + 1)
-            
-            # Combine scores
-            section.importance_rank = keyword_score + position_score
+        for i, (section, count) in enumerate(zip(sections, keyword_counts)):
+            section.importance_rank = section_score(count, i)
         
         # Sort by score (descending) and return top results
-        return sorted(sections, key=lambda x: (-x.importance_rank, x.section_title))
\ No newline at end of file
+        if top_k is not None:
+            return top_k_sections(sections, top_k)
+        return sorted(sections, key=rank_key)
+    
+    def _rank_sections_bm25(self, sections, persona: str, job: str,
+                            index: Optional[LexicalIndex], top_k: Optional[int],
+                            bodies: Optional[List[str]]) -> List[ExtractedSection]:
+        """Score all sections with one BM25 matrix-vector product; no position bias.
+
+        With top_k, importance_rank is only set on the returned sections.
+        """
+        if isinstance(sections, SectionTable):
+            titles = list(sections.titles())
+        else:
+            titles = [section.section_title for section in sections]
+        if index is None:
+            if bodies is not None and len(bodies) != len(sections):
+                bodies = None
+            index = LexicalIndex(titles, bodies, body_weight=self.options.bm25_body_weight)
+        
+        scores = index.scores(query_keywords(persona, job, word_boundary=True))
+        return self._select_sections(sections, scores, titles, top_k)
+    
+    def _select_sections(self, sections, scores, titles: List[str],
+                         top_k: Optional[int]) -> List[ExtractedSection]:
+        """Return the top_k sections in rank order with their scores as importance_rank."""
+        ranked = []
+        for i in top_k_indices(scores, titles, top_k):
+            if isinstance(sections, SectionTable):
+                ranked.append(sections.section(i, float(scores[i])))
+            else:
+                sections[i].importance_rank = float(scores[i])
+                ranked.append(sections[i])
+        return ranked
\ No newline at end of file
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .cache import sha256_file, write_json_atomic
+from .document_processor import DocumentProcessor
+from .models import DocumentAnalysis, Metadata
+from .scheduling import Deadline
+from .sections import SectionTable
+
+# Bump when the layout of the manifest changes
+MANIFEST_FORMAT_VERSION = 1
+
+class IncrementalAnalyzer:
+    """Re-analyses a document collection in time proportional to what changed.
+
+    A persisted manifest holds each document's extraction results (page texts,
+    candidate titles and the relevance flags computed so far), keyed by path
+    and validated by size and mtime, falling back to the content hash when
+    only the mtime moved. Each run extracts added or modified PDFs, drops
+    removed ones and then re-runs only the merge and rank step, so its output
+    matches DocumentProcessor.process_documents.
+
+    The time budget applies as in process_documents: extraction and NER stop
+    early and the analysis is marked partial. Streaming and the result cache
+    are not supported, the manifest already being a store of past results.
+    """
+
+    def __init__(self, processor: DocumentProcessor, manifest_path: str):
+        if processor.options.streaming:
+            raise Exception("Incremental analysis keeps whole documents and is not supported in streaming mode")
+        if processor.results is not None:
+            raise Exception("Incremental analysis reuses its manifest and is not supported with the result cache")
+        self.processor = processor
+        self.manifest_path = manifest_path
+        self.documents: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Results produced by other library versions or detectors are not reused
+        if (manifest.get("version") != MANIFEST_FORMAT_VERSION or
+                manifest.get("namespace") != self.processor.extraction_namespace()):
+            return {}
+        return manifest.get("documents", {})
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(directory, exist_ok=True)
+        write_json_atomic(self.manifest_path, {
+            "version": MANIFEST_FORMAT_VERSION,
+            "namespace": self.processor.extraction_namespace(),
+            "documents": self.documents
+        })
+
+    def analyse(self, document_paths: List[str], persona: str, job_to_be_done: str,
+                top_k: Optional[int] = None) -> DocumentAnalysis:
+        """Bring the manifest up to date with document_paths and return the ranked analysis."""
+        processor = self.processor
+        top_k = processor.options.top_k if top_k is None else top_k
+        processor.profiler.reset()
+
+        metadata = Metadata(
+            input_documents=[os.path.basename(path) for path in document_paths],
+            persona=persona,
+            job_to_be_done=job_to_be_done,
+            processing_timestamp=datetime.now()
+        )
+
+        if processor.options.time_budget is not None:
+            processor._deadline = Deadline(processor.options.time_budget)
+        try:
+            with processor.profiler.stage("manifest_sync"):
+                self._sync(document_paths)
+
+            sections = SectionTable()
+            pages = []
+            for doc_path in document_paths:
+                entry = self.documents.get(doc_path)
+                if entry is None:
+                    # New document skipped for lack of time
+                    continue
+                document = doc_path.split('/')[-1]
+                for row in entry["sections"]:
+                    sections.append(document, *row)
+                pages.extend((doc_path, page_number, text) for page_number, text in enumerate(entry["pages"], start=1))
+
+            unique_pages = pages
+            if processor.options.dedup:
+                sections, unique_pages = processor._deduplicate(sections, pages)
+            
+            limit = top_k if processor.options.lazy_relevance else None
+            selected_pages = processor._select_relevant_pages(unique_pages, limit, relevance=self._page_relevance(unique_pages))
+            subsections = processor._refine_pages(selected_pages[:top_k], processor._refinement_terms(persona, job_to_be_done))
+
+            with processor.profiler.stage("rank_sections"):
+                bodies = sections.bodies
+                if bodies is None and processor._uses_section_bodies():
+                    bodies = processor._section_bodies(pages)
+                ranked_sections = processor._rank_sections(sections, persona, job_to_be_done, top_k=top_k, bodies=bodies)
+        finally:
+            deadline, processor._deadline = processor._deadline, None
+
+        metadata.partial = deadline is not None and deadline.partial
+        self.save()
+        return DocumentAnalysis(
+            metadata=metadata,
+            extracted_sections=ranked_sections[:top_k],
+            subsection_analysis=subsections[:top_k]
+        )
+
+    def _sync(self, document_paths: List[str]):
+        """Extract added or modified documents and forget removed ones."""
+        profiler = self.processor.profiler
+        wanted = set(document_paths)
+        for doc_path in [path for path in self.documents if path not in wanted]:
+            del self.documents[doc_path]
+            profiler.count("documents_removed")
+
+        changed = []
+        for doc_path in dict.fromkeys(document_paths):
+            stat = os.stat(doc_path)
+            entry = self.documents.get(doc_path)
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                profiler.count("documents_reused")
+                continue
+            digest = sha256_file(doc_path)
+            if entry is not None and entry["sha256"] == digest:
+                # Touched but not modified
+                entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+                profiler.count("documents_reused")
+                continue
+            changed.append((doc_path, stat, digest))
+
+        processor = self.processor
+        extracted = processor._extract_documents([path for path, _, _ in changed])
+        for done, ((doc_path, stat, digest), (sections, pages)) in enumerate(zip(changed, extracted), start=1):
+            entry = self.documents[doc_path] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+                "pages": [text for _, text in pages],
+                "sections": processor._section_rows(sections),
+                "relevance": {}
+            }
+            if any(error["document"] == doc_path for error in profiler.errors) or processor._cut_short(doc_path):
+                # Keep the partial results for this run but extract again next time
+                entry["size"] = entry["mtime_ns"] = entry["sha256"] = None
+            profiler.count("documents_extracted")
+            if done < len(changed) and processor._out_of_time():
+                # The rest keep their previous results, if any, and are extracted next time
+                profiler.count("documents_skipped", len(changed) - done)
+                break
+        extracted.close()
+
+    def _page_relevance(self, pages: List[Tuple[str, int, str]]) -> Iterator[bool]:
+        """Yield the relevance of each page, running NER only on pages without a stored flag.
+
+        Under a time budget, pages reached after the deadline are not checked.
+        """
+        known = [self.documents[doc_path]["relevance"].get(str(page_number))
+                 for doc_path, page_number, _ in pages]
+        computed = self.processor._relevant_pages(
+            text for (_, _, text), flag in zip(pages, known) if flag is None
+        )
+        deadline = self.processor._deadline
+        for (doc_path, page_number, _), flag in zip(pages, known):
+            if flag is None:
+                if deadline is not None and deadline.expired():
+                    # Out of time: counts as not relevant, and is not stored
+                    deadline.partial = True
+                    self.processor.profiler.count("pages_unchecked")
+                    yield False
+                    continue
+                flag = next(computed)
+                self.documents[doc_path]["relevance"][str(page_number)] = flag
+            yield flag
+
+def collection_signature(paths: List[str]) -> Tuple:
+    """Cheap fingerprint of a set of files (name, size, mtime); changes when any file does."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+def watch(run: Callable[[], None], watched_paths: Callable[[], List[str]], interval: float = 2.0,
+          max_runs: Optional[int] = None):
+    """Call run() now and again whenever any of watched_paths() changes, polling every interval seconds.
+
+    Errors raised by run() are printed and retried on the next change.
+    """
+    last_signature = None
+    runs = 0
+    while max_runs is None or runs < max_runs:
+        signature = collection_signature(watched_paths())
+        if signature != last_signature:
+            last_signature = signature
+            runs += 1
+            try:
+                run()
+            except Exception as e:
+                print(f"Error: {str(e)}")
+            continue
+        time.sleep(interval)
\ No newline at end of file
@@ -0,0 +1,113 @@
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+# Layout-aware heading detection over PyMuPDF's get_text("dict") output.
+# A heading is a short line set apart from the document's body text by a
+# larger font size, by being bold when body text is regular weight, or by
+# standing alone in its own block.
+
+# Span flag bit PyMuPDF sets for bold fonts
+BOLD_FLAG = 16
+# Lines at least this much larger than the body font are headings
+HEADING_SIZE_RATIO = 1.15
+MAX_HEADING_CHARS = 100
+
+class LayoutLine:
+    __slots__ = ('text', 'size', 'bold', 'block', 'alone')
+
+    def __init__(self, text: str, size: float, bold: bool, block: int, alone: bool):
+        self.text = text
+        self.size = size
+        self.bold = bold
+        self.block = block
+        # Only line of its block with visible text
+        self.alone = alone
+
+def _is_bold(span: Dict[str, Any]) -> bool:
+    return bool(span["flags"] & BOLD_FLAG) or 'bold' in span["font"].lower()
+
+def page_lines(page_dict: Dict[str, Any]) -> List[LayoutLine]:
+    """Flatten a page's dict output into lines with their dominant font size and weight.
+
+    Only spans with visible characters decide a line's size and weight, so
+    trailing spaces set in another font do not matter.
+    """
+    lines = []
+    for block_index, block in enumerate(page_dict["blocks"]):
+        block_lines = block.get("lines", ())
+        visible_lines = sum(1 for line in block_lines if any(span["text"].strip() for span in line["spans"]))
+        for line in block_lines:
+            spans = line["spans"]
+            visible = [span for span in spans if span["text"].strip()]
+            lines.append(LayoutLine(
+                text="".join(span["text"] for span in spans),
+                size=max((round(span["size"], 1) for span in visible), default=0.0),
+                bold=bool(visible) and all(_is_bold(span) for span in visible),
+                block=block_index,
+                alone=visible_lines == 1
+            ))
+    return lines
+
+def page_text(lines: List[LayoutLine]) -> str:
+    """Plain text of a page, as page.get_text() would return it."""
+    return "".join(line.text + "\n" for line in lines)
+
+def body_style(pages: List[Tuple[int, List[LayoutLine]]]) -> Tuple[float, bool]:
+    """Return the (font size, bold) style covering the most characters of a document."""
+    styles = Counter()
+    for _, lines in pages:
+        for line in lines:
+            if line.size:
+                styles[(line.size, line.bold)] += len(line.text.strip())
+    if not styles:
+        return 0.0, False
+    return styles.most_common(1)[0][0]
+
+def _is_heading(line: LayoutLine, text: str, body_size: float, body_bold: bool) -> bool:
+    if not text or len(text) >= MAX_HEADING_CHARS or text.endswith('.'):
+        return False
+    # Bullets, page numbers and rules are not headings
+    if not any(char.isalpha() for char in text):
+        return False
+    if body_size and line.size >= body_size * HEADING_SIZE_RATIO:
+        return True
+    if line.size < body_size:
+        return False
+    if line.bold and not body_bold:
+        return True
+    # A capitalised line in a block of its own, e.g. a heading set in the body font
+    return line.alone and text[0].isupper() and not text.endswith((',', ';', ':'))
+
+def detect_headings(pages: List[Tuple[int, List[LayoutLine]]]) -> List[Tuple[int, str, str]]:
+    """Return (page_number, heading, body) for each heading of a document, in reading order.
+
+    Consecutive heading lines in the same block form one heading. A heading's
+    body is the text up to the next heading, across page breaks; text before
+    the first heading belongs to no section.
+    """
+    body_size, body_bold = body_style(pages)
+    headings = []
+    title_parts = None
+    body_parts = None
+    previous = None
+    for page_number, lines in pages:
+        for line in lines:
+            text = line.text.strip()
+            if _is_heading(line, text, body_size, body_bold):
+                if (previous is not None and title_parts is not None and not body_parts and
+                        previous[0] == page_number and previous[1].block == line.block):
+                    # Continuation of a heading wrapped over several lines
+                    title_parts.append(text)
+                else:
+                    if title_parts is not None:
+                        headings.append((heading_page, " ".join(title_parts), " ".join(body_parts)))
+                    heading_page = page_number
+                    title_parts = [text]
+                    body_parts = []
+                previous = (page_number, line)
+            elif text and body_parts is not None:
+                body_parts.append(text)
+                previous = None
+    if title_parts is not None:
+        headings.append((heading_page, " ".join(title_parts), " ".join(body_parts)))
+    return headings
\ No newline at end of file
@@ -1,10 +1,168 @@
 import os
 import sys
+import glob
+import argparse
+from src.batch import load_jobs, run_batch, SUMMARY_FILENAME
 from src.config_loader import ConfigLoader
 from src.document_processor import DocumentProcessor
-from src.utils import save_analysis_to_json
+from src.incremental import IncrementalAnalyzer, watch
+from src.models import ProcessingOptions, DEFAULT_REFINED_MAX_CHARS, DEFAULT_TOP_K
+from src.server import serve
+from src.utils import save_analysis_to_json, save_profile_report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Persona-driven document analysis")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to ingest PDFs (default: 1)")
+    parser.add_argument("--split-pages", type=int, default=200,
+                        help="With several workers, split PDFs longer than this many pages into page ranges (default: 200, 0 disables)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                        help=f"Number of sections and subsections to report (default: {DEFAULT_TOP_K})")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory of the persistent extraction cache (disabled by default)")
+    parser.add_argument("--word-boundary", action="store_true",
+                        help="Match ranking keywords against whole words instead of substrings")
+    parser.add_argument("--ranking", choices=["keyword", "bm25"], default="keyword",
+                        help="Section ranking: keyword matches with position bias, or BM25 over titles and body text")
+    parser.add_argument("--relevance", choices=["spacy", "rules"], default="spacy",
+                        help="Page relevance detector: spaCy NER, or model-free rules for fast start-up")
+    parser.add_argument("--gazetteer", metavar="PATH", default=None,
+                        help="File of extra place names, one per line, for --relevance rules")
+    parser.add_argument("--headings", choices=["text", "layout"], default="text",
+                        help="Section heading detection: line heuristics, or font size and weight from the PDF layout")
+    parser.add_argument("--time-budget", type=float, metavar="SECONDS", default=None,
+                        help="Return the best result found within SECONDS, marked partial if analysis was cut short")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Collapse repeated section titles and duplicate pages before relevance checks and ranking")
+    parser.add_argument("--prefetch", type=int, metavar="N", default=0,
+                        help="Read the next N PDFs in the background while the current one is parsed (default: 0, off)")
+    parser.add_argument("--prefetch-max-mb", type=int, metavar="MB", default=128,
+                        help="Memory cap of --prefetch in megabytes (default: 128)")
+    parser.add_argument("--refine", choices=["page", "extractive"], default="page",
+                        help="Subsection text: the whole relevant page, or its sentences best matching the persona/job")
+    parser.add_argument("--refine-max-chars", type=int, metavar="N", default=DEFAULT_REFINED_MAX_CHARS,
+                        help=f"Length bound of --refine extractive subsections (default: {DEFAULT_REFINED_MAX_CHARS})")
+    parser.add_argument("--result-cache", type=int, metavar="N", default=0,
+                        help="Keep the last N analyses in memory and answer repeated queries from them (default: 0, off)")
+    parser.add_argument("--result-cache-mb", type=int, metavar="MB", default=16,
+                        help="Memory bound of --result-cache in megabytes (default: 16)")
+    parser.add_argument("--no-mmap", action="store_true",
+                        help="Open PDFs by path instead of from a memory-mapped buffer")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Process pages in one bounded-memory pass (for very large PDFs)")
+    parser.add_argument("--profile-report", action="store_true",
+                        help="Write per-stage timings and counters to profile_report.json next to the output")
+    parser.add_argument("--cprofile", metavar="PATH", default=None,
+                        help="Dump cProfile statistics of the analysis to PATH")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run a resident HTTP server instead of a one-shot analysis")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address the server listens on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080,
+                        help="Port the server listens on (default: 8080)")
+    parser.add_argument("--pdf-root", metavar="DIR", action="append", default=None,
+                        help="Directory a request's pdf_dir may point into; repeatable "
+                             "(default: only /data/input/PDFs)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse per-document results from a manifest and only extract added or modified PDFs")
+    parser.add_argument("--manifest", metavar="PATH", default=None,
+                        help="Manifest file for --incremental (default: analysis_manifest.json next to the output)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-analyse incrementally whenever the input or PDFs change")
+    parser.add_argument("--watch-interval", type=float, default=2.0,
+                        help="Seconds between checks for changes in --watch mode (default: 2)")
+    parser.add_argument("--batch", metavar="SOURCE", default=None,
+                        help="Run every input config in a directory, or the jobs listed in a manifest file")
+    return parser.parse_args(argv)
+
+def build_options(args) -> ProcessingOptions:
+    return ProcessingOptions(
+        num_workers=args.workers,
+        split_pages_threshold=args.split_pages,
+        top_k=args.top_k,
+        cache_dir=args.cache_dir,
+        word_boundary_matching=args.word_boundary,
+        streaming=args.streaming,
+        cprofile_path=args.cprofile,
+        ranking=args.ranking,
+        relevance_backend=args.relevance,
+        gazetteer_path=args.gazetteer,
+        mmap_pdfs=not args.no_mmap,
+        heading_detection=args.headings,
+        time_budget=args.time_budget,
+        dedup=args.dedup,
+        prefetch_depth=args.prefetch,
+        prefetch_max_bytes=args.prefetch_max_mb * 1024 * 1024,
+        refinement=args.refine,
+        refined_max_chars=args.refine_max_chars,
+        result_cache_entries=args.result_cache,
+        result_cache_max_bytes=args.result_cache_mb * 1024 * 1024
+    )
+
+def run_batch_mode(source: str, pdfs_dir: str, output_dir: str, args):
+    os.makedirs(output_dir, exist_ok=True)
+    summary_path = os.path.join(output_dir, SUMMARY_FILENAME)
+    try:
+        jobs = load_jobs(source, output_dir, pdfs_dir)
+        results = run_batch(jobs, build_options(args), max_workers=args.workers,
+                            summary_path=summary_path)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    
+    for result in results:
+        if result.succeeded:
+            print(f"OK     {result.input_path} ({result.seconds:.2f}s) -> {result.output_path}")
+        else:
+            print(f"FAILED {result.input_path}: {result.error}")
+    failed = sum(1 for result in results if not result.succeeded)
+    print(f"Batch complete: {len(results) - failed} succeeded, {failed} failed. Summary saved to {summary_path}")
+    if failed:
+        sys.exit(1)
+
+def run_incremental_mode(input_json: str, pdfs_dir: str, output_dir: str, output_file: str, args):
+    manifest_path = args.manifest or os.path.join(output_dir, "analysis_manifest.json")
+    try:
+        processor = DocumentProcessor(build_options(args))
+        analyzer = IncrementalAnalyzer(processor, manifest_path)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    
+    def run():
+        config = ConfigLoader.load_input_config(input_json)
+        pdf_files = [os.path.join(pdfs_dir, doc.filename) for doc in config.documents]
+        for pdf_file in pdf_files:
+            if not os.path.exists(pdf_file):
+                raise Exception(f"PDF file not found: {pdf_file}")
+        
+        analysis = analyzer.analyse(pdf_files, config.persona.role, config.job_to_be_done.task)
+        save_analysis_to_json(analysis, output_file, top_k=args.top_k)
+        counters = processor.profiler.counters
+        print(f"Analysis complete ({counters.get('documents_extracted', 0)} extracted, "
+              f"{counters.get('documents_reused', 0)} reused, {counters.get('documents_removed', 0)} removed). "
+              f"Results saved to {output_file}")
+        if args.profile_report:
+            save_profile_report(processor.profiler.report(), os.path.join(output_dir, "profile_report.json"))
+    
+    try:
+        if args.watch:
+            print(f"Watching {input_json} and {pdfs_dir} for changes")
+            watch(run, lambda: [input_json] + sorted(glob.glob(os.path.join(pdfs_dir, "*.pdf"))),
+                  interval=args.watch_interval)
+        else:
+            run()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    finally:
+        processor.close()
 
 def main():
+    args = parse_args()
+    
     # Configure paths
     # input_dir = os.path.join(os.getcwd(), "data", "input")  
     # output_dir = os.path.join(os.getcwd(), "data", "output")
@@ -14,6 +172,16 @@ def main():
     input_json = os.path.join(input_dir, "challenge1b_input.json")
     output_file = os.path.join(output_dir, "analysis_output.json")
     
+    if args.serve:
+        # Each server worker keeps one warmed processor; --workers sizes the pool
+        serve(args.host, args.port, build_options(args),
+              max_workers=args.workers, default_pdf_dir=pdfs_dir, pdf_roots=args.pdf_root)
+        return
+    
+    if args.batch:
+        run_batch_mode(args.batch, pdfs_dir, output_dir, args)
+        return
+    
     # Validate directories and files
     if not os.path.exists(input_dir):
         print(f"Error: Input directory {input_dir} does not exist")
@@ -29,12 +197,16 @@ def main():
     
     os.makedirs(output_dir, exist_ok=True)
     
+    if args.watch or args.incremental:
+        run_incremental_mode(input_json, pdfs_dir, output_dir, output_file, args)
+        return
+    
     try:
         # Load configuration
         config = ConfigLoader.load_input_config(input_json)
         
         # Initialize processor
-        processor = DocumentProcessor()
+        processor = DocumentProcessor(build_options(args))
         
         # Get full paths for PDF files
         pdf_files = [
@@ -55,10 +227,17 @@ def main():
             job_to_be_done=config.job_to_be_done.task
         )
         
+        processor.close()
+        
         # Save results
-        save_analysis_to_json(analysis, output_file)
+        save_analysis_to_json(analysis, output_file, top_k=args.top_k)
         print(f"Analysis complete. Results saved to {output_file}")
         
+        if args.profile_report:
+            report_file = os.path.join(output_dir, "profile_report.json")
+            save_profile_report(processor.profiler.report(), report_file)
+            print(f"Profile report saved to {report_file}")
+        
     except Exception as e:
         print(f"Error: {str(e)}")
         sys.exit(1)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 # Input JSON models
@@ -29,6 +29,64 @@ class InputConfig:
     persona: Persona
     job_to_be_done: JobToBeDone
 
+# Number of sections and subsections reported in the analysis output
+DEFAULT_TOP_K = 5
+# Length bound of extractive subsection refinements, in characters
+DEFAULT_REFINED_MAX_CHARS = 600
+
+# Processing options
+@dataclass
+class ProcessingOptions:
+    # Number of worker processes used to ingest documents (1 = sequential)
+    num_workers: int = 1
+    # Number of pages streamed through spaCy's nlp.pipe at a time
+    nlp_batch_size: int = 32
+    # Number of ranked sections and relevant pages kept in the analysis
+    top_k: int = DEFAULT_TOP_K
+    # Stop NER checks once the top_k relevant pages are known
+    lazy_relevance: bool = True
+    # Directory of the persistent extraction cache (None disables caching)
+    cache_dir: Optional[str] = None
+    # Size bound of the extraction cache; least recently used entries are evicted
+    cache_max_bytes: int = 256 * 1024 * 1024
+    # Match ranking keywords against whole title words instead of substrings
+    word_boundary_matching: bool = False
+    # Process pages in a single bounded-memory pass (sequential, ignores num_workers)
+    streaming: bool = False
+    # Dump cProfile statistics of each process_documents call to this path
+    cprofile_path: Optional[str] = None
+    # Section ranking: "keyword" (keyword matches plus position bias) or "bm25"
+    ranking: str = "keyword"
+    # Weight of the text beneath each title in BM25 ranking (0 ranks titles only)
+    bm25_body_weight: float = 0.5
+    # Page relevance detector: "spacy" (statistical NER) or "rules" (model-free gazetteer and patterns)
+    relevance_backend: str = "spacy"
+    # File of extra place names (one per line) for the rules backend
+    gazetteer_path: Optional[str] = None
+    # PDFs with more pages are split into page ranges extracted by several workers (0 disables)
+    split_pages_threshold: int = 200
+    # Open PDFs from a memory-mapped buffer instead of by path (fewer reads on network filesystems);
+    # PyMuPDF releases without memoryview streams, such as the pinned 1.21.1, open by path regardless
+    mmap_pdfs: bool = True
+    # Section heading detection: "text" (line heuristics) or "layout" (font size and weight)
+    heading_detection: str = "text"
+    # Seconds process_documents may take; past it the best result so far is returned, marked partial
+    time_budget: Optional[float] = None
+    # Collapse repeated section titles and skip NER on (near-)duplicate pages
+    dedup: bool = False
+    # Documents whose bytes are read ahead on a background thread during sequential extraction (0 disables)
+    prefetch_depth: int = 0
+    # Most bytes held by read-ahead; larger documents are read directly
+    prefetch_max_bytes: int = 128 * 1024 * 1024
+    # Subsection text: "page" (the whole relevant page) or "extractive" (its sentences best matching the query)
+    refinement: str = "page"
+    # Length bound of extractive refinements, in characters
+    refined_max_chars: int = DEFAULT_REFINED_MAX_CHARS
+    # Finished analyses kept in memory for repeated queries (0 disables)
+    result_cache_entries: int = 0
+    # Approximate memory bound of those analyses
+    result_cache_max_bytes: int = 16 * 1024 * 1024
+
 # Input PDF models
 @dataclass
 class Metadata:
@@ -36,9 +94,13 @@ class Metadata:
     persona: str
     job_to_be_done: str
     processing_timestamp: datetime
+    # Set when the time budget ran out before every page was analysed
+    partial: bool = False
 
+# Created per candidate section and relevant page, so they carry no per-instance __dict__
 @dataclass
 class ExtractedSection:
+    __slots__ = ('document', 'section_title', 'importance_rank', 'page_number')
     document: str
     section_title: str
     importance_rank: int
@@ -46,6 +108,7 @@ class ExtractedSection:
 
 @dataclass
 class SubsectionAnalysis:
+    __slots__ = ('document', 'refined_text', 'page_number')
     document: str
     refined_text: str
     page_number: int
@@ -54,4 +117,19 @@ class SubsectionAnalysis:
 class DocumentAnalysis:
     metadata: Metadata
     extracted_sections: List[ExtractedSection]
-    subsection_analysis: List[SubsectionAnalysis]
\ No newline at end of file
+    subsection_analysis: List[SubsectionAnalysis]
+
+# Batch models
+@dataclass
+class BatchJob:
+    input_path: str
+    output_path: str
+    pdf_dir: str
+
+@dataclass
+class BatchJobResult:
+    input_path: str
+    output_path: str
+    succeeded: bool
+    seconds: float
+    error: Optional[str] = None
\ No newline at end of file
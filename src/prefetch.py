@@ -0,0 +1,106 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+def read_file(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+class Prefetcher:
+    """Reads the raw bytes of upcoming documents on a background thread.
+
+    Documents are read in the order they will be processed, at most depth
+    documents and max_bytes ahead of the consumer, so disk or network
+    latency overlaps with parsing the current document. Documents larger
+    than max_bytes are left to be read directly. File reads release the
+    GIL, so one reader thread is enough to keep the next files arriving.
+    """
+
+    def __init__(self, paths: List[str], depth: int = 2, max_bytes: int = 128 * 1024 * 1024):
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self._upcoming = deque(dict.fromkeys(paths))
+        self._position = {path: i for i, path in enumerate(self._upcoming)}
+        self._ready: Dict[str, Future] = {}
+        self._sizes: Dict[str, int] = {}
+        # Bytes read (or being read) but not yet taken
+        self.buffered_bytes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._fill()
+
+    def _fill(self):
+        while self._upcoming and len(self._ready) < self.depth:
+            path = self._upcoming[0]
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                # Let the reader report the error
+                self._upcoming.popleft()
+                continue
+            if size > self.max_bytes:
+                self._upcoming.popleft()
+                continue
+            if self.buffered_bytes + size > self.max_bytes:
+                break
+            self._upcoming.popleft()
+            self._sizes[path] = size
+            self.buffered_bytes += size
+            self._ready[path] = self._executor.submit(read_file, path)
+
+    def _discard(self, path: str):
+        future = self._ready.pop(path)
+        future.cancel()
+        self.buffered_bytes -= self._sizes.pop(path)
+
+    def _advance(self, position: int):
+        # Documents due before position that were never taken (e.g. served
+        # from a cache) are dropped to make room for the next reads
+        for earlier in [other for other in self._ready if self._position[other] < position]:
+            self._discard(earlier)
+        while self._upcoming and self._position[self._upcoming[0]] < position:
+            self._upcoming.popleft()
+
+    def _result(self, path: str) -> Optional[bytes]:
+        try:
+            return self._ready[path].result()
+        except OSError:
+            return None
+
+    def take(self, path: str) -> Optional[bytes]:
+        """Return the bytes of path, waiting for its read to finish; None if it was not prefetched.
+
+        Documents due before path that were never taken are dropped.
+        """
+        position = self._position.get(path)
+        if position is None:
+            return None
+        self._advance(position)
+        if self._upcoming and self._upcoming[0] == path:
+            # Too late to read ahead; the caller reads it directly
+            self._upcoming.popleft()
+        data = None
+        if path in self._ready:
+            data = self._result(path)
+            self._discard(path)
+        self._fill()
+        return data
+
+    def peek(self, path: str) -> Optional[bytes]:
+        """Return the bytes of path like take(), but keep them for a later take().
+
+        Lets a caller hash a document before deciding whether to parse it.
+        A document not read ahead yet is read now, so it is read only once.
+        """
+        position = self._position.get(path)
+        if position is None:
+            return None
+        self._advance(position)
+        self._fill()
+        return self._result(path) if path in self._ready else None
+
+    def close(self):
+        for path in list(self._ready):
+            self._discard(path)
+        self._upcoming.clear()
+        self._executor.shutdown(wait=False)
\ No newline at end of file
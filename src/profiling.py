@@ -0,0 +1,111 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in kilobytes, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _new_stats() -> Dict[str, float]:
+    return {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0}
+
+class Profiler:
+    """Collects per-stage and per-document timings and counters for one analysis.
+
+    Stages are timed with wall-clock and process CPU time. Stage timings and
+    counters attributed to a document are also recorded under that document.
+    Snapshots taken in worker processes can be merged into the parent's
+    profiler.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.errors: List[Dict[str, Optional[str]]] = []
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str, document: Optional[str] = None):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - wall_start, time.process_time() - cpu_start, document)
+
+    def add_time(self, name: str, wall_seconds: float, cpu_seconds: float,
+                 document: Optional[str] = None, calls: int = 1):
+        targets = [self.stages]
+        if document is not None:
+            targets.append(self._document(document)["stages"])
+        for stages in targets:
+            stats = stages.setdefault(name, _new_stats())
+            stats["wall_seconds"] += wall_seconds
+            stats["cpu_seconds"] += cpu_seconds
+            stats["calls"] += calls
+
+    def count(self, name: str, amount: int = 1, document: Optional[str] = None):
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if document is not None:
+            counters = self._document(document)["counters"]
+            counters[name] = counters.get(name, 0) + amount
+
+    def error(self, message: str, document: Optional[str] = None):
+        self.errors.append({"document": document, "message": message})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the collected data as plain (picklable) dictionaries."""
+        return {
+            "stages": self.stages,
+            "counters": self.counters,
+            "documents": self.documents,
+            "errors": self.errors
+        }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add a snapshot taken by another profiler, e.g. in a worker process."""
+        for name, stats in snapshot["stages"].items():
+            self.add_time(name, stats["wall_seconds"], stats["cpu_seconds"], calls=stats["calls"])
+        for name, amount in snapshot["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+        for document, data in snapshot["documents"].items():
+            for name, stats in data["stages"].items():
+                stages = self._document(document)["stages"]
+                merged = stages.setdefault(name, _new_stats())
+                for field in merged:
+                    merged[field] += stats[field]
+            for name, amount in data["counters"].items():
+                counters = self._document(document)["counters"]
+                counters[name] = counters.get(name, 0) + amount
+        self.errors.extend(snapshot["errors"])
+
+    def report(self) -> Dict[str, Any]:
+        """Return the machine-readable report for everything recorded since reset()."""
+        report = {
+            "wall_seconds": time.perf_counter() - self._wall_start,
+            "cpu_seconds": time.process_time() - self._cpu_start,
+            "peak_rss_kb": peak_rss_kb()
+        }
+        report.update(self.snapshot())
+        return report
+
+    def _document(self, document: str) -> Dict[str, Any]:
+        data = self.documents.get(document)
+        if data is None:
+            data = self.documents[document] = {"stages": {}, "counters": {}}
+        return data
\ No newline at end of file
@@ -0,0 +1,234 @@
+import re
+import heapq
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+# Keywords that are always relevant to travel-planning personas
+TASK_KEYWORDS = {'travel', 'tour', 'trip', 'plan', 'guide', 'experience', 'adventure'}
+
+_WORD_RE = re.compile(r"\w+")
+
+def section_score(keyword_count: int, position: int) -> float:
+    """Score of a section from its keyword matches and its position in the corpus."""
+    # Calculate base score from keyword matches
+    keyword_score = 2 * keyword_count
+    
+    # Add position bias (earlier sections get slightly higher score)
+    position_score = 1.0 / (position + 1)
+    
+    # Combine scores
+    return keyword_score + position_score
+
+def section_scores(keyword_counts: Sequence[int]) -> np.ndarray:
+    """Vectorized section_score for sections at positions 0..n-1."""
+    counts = np.asarray(keyword_counts, dtype=np.float64)
+    return 2 * counts + 1.0 / (np.arange(len(counts)) + 1)
+
+def keyword_count(title: str, keywords: Set[str], word_boundary: bool = False) -> int:
+    """Count the keywords matching a single title, with SectionIndex semantics.
+
+    Used where titles arrive one at a time and no index can be built upfront.
+    """
+    title_lower = title.lower()
+    if word_boundary:
+        return len(keywords.intersection(_WORD_RE.findall(title_lower)))
+    return sum(1 for keyword in keywords if keyword in title_lower)
+
+def rank_key(section) -> Tuple[float, str]:
+    """Sort key of a scored section: highest score first, then title."""
+    return (-section.importance_rank, section.section_title)
+
+def top_k_sections(sections: Iterable[Any], k: int) -> List[Any]:
+    """Return the k best scored sections in rank order.
+
+    Uses a bounded heap (O(n log k)) and is equivalent to
+    sorted(sections, key=rank_key)[:k], ties included.
+    """
+    return heapq.nsmallest(k, sections, key=rank_key)
+
+class _TopKEntry:
+    __slots__ = ('key', 'seq', 'item')
+
+    def __init__(self, key, seq: int, item):
+        self.key = key
+        self.seq = seq
+        self.item = item
+
+    def __lt__(self, other: '_TopKEntry') -> bool:
+        # "Less than" means "ranks worse", so the heap root is the worst entry kept
+        return (self.key, self.seq) > (other.key, other.seq)
+
+class TopK:
+    """Bounded accumulator of the k smallest items under a key.
+
+    Items can be pushed one at a time while memory stays O(k). items() equals
+    sorted(all_pushed, key=key)[:k], ties broken by insertion order.
+    """
+
+    def __init__(self, k: int, key=rank_key):
+        self.k = k
+        self.key = key
+        self._heap: List[_TopKEntry] = []
+        self._seq = 0
+
+    def push(self, item) -> None:
+        entry = _TopKEntry(self.key(item), self._seq, item)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k > 0 and self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        return [entry.item for entry in sorted(self._heap, reverse=True)]
+
+def query_keywords(persona: str, job: str, word_boundary: bool = False) -> Set[str]:
+    """Return the lowercase keywords used to score sections for a persona and job.
+
+    In the default substring mode keywords are whitespace-separated tokens,
+    punctuation included; in word-boundary mode they are bare words.
+    """
+    text = f"{persona.lower()} {job.lower()}"
+    keywords = set(_WORD_RE.findall(text) if word_boundary else text.split())
+    keywords.update(TASK_KEYWORDS)
+    return keywords
+
+class SectionIndex:
+    """Inverted index from title tokens to section ids.
+
+    Titles are tokenized once; scoring then looks keywords up in the index
+    instead of scanning every title for every keyword. In substring mode a
+    keyword matches a title if it occurs anywhere in it (so "plan" matches
+    "planet"), which is equivalent to occurring inside one of the title's
+    whitespace-separated tokens because keywords never contain whitespace.
+    In word-boundary mode a keyword must equal one of the title's words.
+
+    An index can be reused to score the same corpus against many queries.
+    """
+
+    def __init__(self, titles: Iterable[str], word_boundary: bool = False):
+        self.word_boundary = word_boundary
+        self.size = 0
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for section_id, title in enumerate(titles):
+            title_lower = title.lower()
+            tokens = _WORD_RE.findall(title_lower) if word_boundary else title_lower.split()
+            for token in set(tokens):
+                postings[token].append(section_id)
+            self.size += 1
+        self._postings = dict(postings)
+        self._matches: Dict[str, FrozenSet[int]] = {}
+
+    def matching(self, keyword: str) -> FrozenSet[int]:
+        """Return the ids of the sections whose title matches a keyword."""
+        matches = self._matches.get(keyword)
+        if matches is None:
+            if self.word_boundary:
+                matches = frozenset(self._postings.get(keyword, ()))
+            else:
+                # Substring lookups scan the vocabulary, not the sections
+                ids = set()
+                for token, section_ids in self._postings.items():
+                    if keyword in token:
+                        ids.update(section_ids)
+                matches = frozenset(ids)
+            self._matches[keyword] = matches
+        return matches
+
+    def keyword_counts(self, keywords: Iterable[str]) -> List[int]:
+        """Return, per section id, how many of the keywords match its title."""
+        counts = [0] * self.size
+        for keyword in keywords:
+            for section_id in self.matching(keyword):
+                counts[section_id] += 1
+        return counts
+
+class LexicalIndex:
+    """BM25 term-section matrix over section titles and, optionally, their body text.
+
+    The matrix is built once per corpus and stored sparsely as parallel
+    (section id, term id, weight) arrays, where each weight is the BM25
+    term-frequency component of a term in a section. Scoring a query is a
+    single sparse matrix-vector product with the query's IDF vector, so it
+    costs milliseconds even for 100k+ sections and an index can be reused
+    across queries.
+
+    Title and body are combined BM25F-style: term frequencies are length
+    normalised per field, weighted, summed and then saturated with k1.
+    Terms are lowercase words, as in word-boundary matching.
+    """
+
+    def __init__(self, titles: Iterable[str], bodies: Optional[Iterable[str]] = None,
+                 title_weight: float = 1.0, body_weight: float = 0.5,
+                 k1: float = 1.2, b: float = 0.75):
+        self.vocabulary: Dict[str, int] = {}
+        fields = [(list(titles), title_weight)]
+        if bodies is not None and body_weight > 0:
+            fields.append((list(bodies), body_weight))
+        self.size = len(fields[0][0])
+        
+        section_ids = []
+        term_ids = []
+        weights = []
+        for texts, field_weight in fields:
+            if len(texts) != self.size:
+                raise Exception(f"Expected {self.size} section bodies, got {len(texts)}")
+            field_sections, field_terms = self._tokenize(texts)
+            lengths = np.bincount(field_sections, minlength=self.size).astype(np.float64)
+            average = lengths.mean() if self.size else 0.0
+            if average == 0:
+                average = 1.0
+            norm = 1.0 - b + b * lengths / average
+            section_ids.append(field_sections)
+            term_ids.append(field_terms)
+            weights.append(field_weight / norm[field_sections])
+        
+        section_ids = np.concatenate(section_ids)
+        term_ids = np.concatenate(term_ids)
+        weights = np.concatenate(weights)
+        
+        # Sum occurrences of the same term in the same section (across fields)
+        pairs, inverse = np.unique(section_ids * len(self.vocabulary) + term_ids, return_inverse=True)
+        tf = np.bincount(inverse, weights=weights, minlength=len(pairs))
+        self._sections = pairs // max(len(self.vocabulary), 1)
+        self._terms = pairs % max(len(self.vocabulary), 1)
+        self._weights = tf * (k1 + 1) / (tf + k1)
+        
+        df = np.bincount(self._terms, minlength=len(self.vocabulary))
+        self.idf = np.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+
+    def _tokenize(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        vocabulary = self.vocabulary
+        section_ids = []
+        term_ids = []
+        for section_id, text in enumerate(texts):
+            tokens = _WORD_RE.findall(text.lower())
+            section_ids.extend([section_id] * len(tokens))
+            term_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        return np.array(section_ids, dtype=np.int64), np.array(term_ids, dtype=np.int64)
+
+    def scores(self, keywords: Iterable[str]) -> np.ndarray:
+        """Return the BM25 score of every section for a query."""
+        query = np.zeros(len(self.vocabulary))
+        for keyword in keywords:
+            term_id = self.vocabulary.get(keyword)
+            if term_id is not None:
+                query[term_id] = self.idf[term_id]
+        return np.bincount(self._sections, weights=query[self._terms] * self._weights,
+                           minlength=self.size)
+
+def top_k_indices(scores: np.ndarray, titles: Sequence[str], k: Optional[int] = None) -> List[int]:
+    """Return the ids of the k best sections in rank_key order, ties kept in input order.
+
+    Only sections scoring at least the k-th best score are sorted.
+    """
+    candidates = np.arange(len(scores))
+    if k is not None and k < len(scores):
+        if k <= 0:
+            return []
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    candidate_titles = np.array([titles[i] for i in candidates], dtype=str)
+    order = np.lexsort((candidates, candidate_titles, -scores[candidates]))
+    return candidates[order][:k].tolist()
\ No newline at end of file
@@ -0,0 +1,63 @@
+import re
+from typing import Iterable, List, Set
+from .models import DEFAULT_REFINED_MAX_CHARS
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+|\s*•\s*')
+_WORD_RE = re.compile(r"\w+")
+_STOP_WORDS = {'and', 'the', 'for', 'with', 'from', 'that', 'this', 'into', 'your', 'their', 'are', 'was'}
+
+def query_terms(keywords: Iterable[str]) -> Set[str]:
+    """Reduce ranking keywords to the words worth matching in sentences."""
+    terms = set()
+    for keyword in keywords:
+        terms.update(word for word in _WORD_RE.findall(keyword.lower())
+                     if len(word) >= 3 and word not in _STOP_WORDS and not word.isdigit())
+    return terms
+
+def split_sentences(text: str) -> List[str]:
+    """Split refined page text into sentences and bullet items."""
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence.strip()]
+
+def _matches(word: str, terms: Set[str]) -> bool:
+    # Prefix matching lets "plan" match "planning" and "trip" match "trips"
+    return word in terms or any(len(term) >= 4 and word.startswith(term) for term in terms)
+
+def sentence_score(sentence: str, terms: Set[str]) -> int:
+    """Number of distinct query terms matched by a sentence."""
+    words = set(_WORD_RE.findall(sentence.lower()))
+    return sum(1 for word in words if _matches(word, terms))
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip(' ,;:')
+
+def extractive_summary(text: str, terms: Set[str], max_chars: int = DEFAULT_REFINED_MAX_CHARS) -> str:
+    """Return the sentences of text that best match terms, in their original order, within max_chars.
+
+    Sentences are taken greedily by score (earlier first on ties) while they
+    fit. A page without any matching sentence falls back to its opening
+    sentences.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ''
+    scores = [sentence_score(sentence, terms) for sentence in sentences]
+    order = sorted(range(len(sentences)), key=lambda i: -scores[i])
+    matched = scores[order[0]] > 0
+
+    chosen = []
+    length = 0
+    for i in order:
+        if matched and scores[i] == 0:
+            break
+        added = len(sentences[i]) + (1 if chosen else 0)
+        if length + added > max_chars:
+            if not chosen:
+                # Even the best sentence is too long
+                return _truncate(sentences[i], max_chars)
+            continue
+        chosen.append(i)
+        length += added
+    return ' '.join(sentences[i] for i in sorted(chosen))
\ No newline at end of file
@@ -0,0 +1,191 @@
+import re
+import hashlib
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set
+from .models import ProcessingOptions
+
+# Relevance backends decide whether a page mentions named entities. spaCy is
+# imported and its model loaded only on first use, so code paths that never
+# check relevance do not pay for them.
+
+def _model_config_path(model: str) -> Optional[Path]:
+    """Return the config.cfg of an installed model package or model directory, if found."""
+    from spacy import util
+    if util.is_package(model):
+        package_path = util.get_package_path(model)
+        meta = util.get_model_meta(package_path)
+        path = package_path / f"{meta['lang']}_{meta['name']}-{meta['version']}"
+    else:
+        path = Path(model)
+    config_path = path / "config.cfg"
+    return config_path if config_path.exists() else None
+
+def _listened_components(block, components: Dict[str, Dict]) -> Set[str]:
+    """Names of the embedding components a model block listens to, e.g. a shared tok2vec."""
+    names = set()
+    if isinstance(block, dict):
+        if "Listener" in str(block.get("@architectures", "")):
+            upstream = block.get("upstream", "*")
+            names.update(name for name, component in components.items()
+                         if name == upstream or (upstream == "*" and component.get("factory") in ("tok2vec", "transformer")))
+        for value in block.values():
+            names |= _listened_components(value, components)
+    return names
+
+def _ner_components(config) -> Optional[Set[str]]:
+    """The pipeline components NER needs: itself and the embedding layers it listens to."""
+    components = config.get("components", {})
+    if "ner" not in components:
+        return None
+    return {"ner"} | _listened_components(components["ner"], components)
+
+def _load_ner_pipeline(model: str):
+    """Load a spaCy model with only NER and what NER depends on.
+
+    Relevance checks only look at doc.ents, so the tagger, parser, lemmatizer
+    and friends are dead weight. They are excluded before loading, per the
+    model's config, so they are never built and their weights never read.
+    Models without a readable config are loaded whole and trimmed afterwards.
+    """
+    import spacy
+    from spacy import util
+    config_path = _model_config_path(model)
+    if config_path is not None:
+        config = util.load_config(config_path)
+        needed = _ner_components(config)
+        if needed is not None:
+            return spacy.load(model, exclude=[name for name in config["nlp"]["pipeline"] if name not in needed])
+    nlp = spacy.load(model)
+    needed = {"ner"}
+    for name, component in nlp.pipeline:
+        # Keep shared embedding layers that the NER component listens to
+        if "ner" in getattr(component, "listening_components", []):
+            needed.add(name)
+    for name in nlp.pipe_names:
+        if name not in needed:
+            nlp.disable_pipe(name)
+    return nlp
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+class SpacyRelevance:
+    """A page is relevant if spaCy's statistical NER finds at least one entity."""
+
+    def __init__(self, model: str = "en_core_web_sm", batch_size: int = 32):
+        self.model = model
+        self.batch_size = batch_size
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            # Load a smaller spaCy model to stay within size constraints
+            self._nlp = _load_ner_pipeline(self.model)
+        return self._nlp
+
+    def load(self):
+        self.nlp
+
+    def version(self) -> str:
+        """Identify the library and model, for cache invalidation, without loading the model if possible."""
+        model_version = _package_version(self.model)
+        if model_version is None:
+            model_version = self.nlp.meta.get('version')
+        return f"spacy={_package_version('spacy')}|model={self.model}-{model_version}"
+
+    def relevant_pages(self, texts: Iterable[str]) -> Iterator[bool]:
+        for doc in self.nlp.pipe(texts, batch_size=self.batch_size):
+            yield len(doc.ents) > 0
+
+# Place names recognised by the rule-based backend out of the box
+DEFAULT_GAZETTEER = {
+    "France", "Paris", "Nice", "Marseille", "Lyon", "Toulouse", "Bordeaux", "Montpellier", "Cannes",
+    "Avignon", "Arles", "Nimes", "Aix-en-Provence", "Antibes", "Carcassonne", "Perpignan", "Monaco",
+    "Provence", "Riviera", "Corsica", "Europe", "Spain", "Italy", "Germany", "Switzerland",
+    "England", "London", "Rome", "Madrid", "Barcelona", "Berlin", "Mediterranean", "Alps"
+}
+
+_MONTHS = ("January|February|March|April|May|June|July|August|September|October|November|December|"
+           "Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec")
+_DATE_RE = re.compile(
+    rf"\b(?:\d{{1,2}}\s+(?:{_MONTHS})\b|(?:{_MONTHS})\s+\d{{1,2}}(?:st|nd|rd|th)?\b"
+    r"|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b|\d{4}-\d{2}-\d{2}\b"
+    r"|(?:in|since|until|by|from|of|to)\s+(?:1[0-9]|20)\d{2}\b"
+    r"|(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)s?\b)"
+)
+_CAPITALIZED = r"[A-Z][\w'-]*[a-z][\w'-]*"
+# Two or more capitalised words in a row, e.g. "Palais des Papes" or "Pont du Gard"
+_PROPER_NOUN_RUN_RE = re.compile(rf"\b{_CAPITALIZED}(?:\s+(?:(?:de|du|des|la|le|of|the)\s+)?{_CAPITALIZED})+")
+# A single capitalised word that does not start a sentence or a line
+_MID_SENTENCE_CAPITAL_RE = re.compile(rf"(?<=[a-z,;:)] ){_CAPITALIZED}")
+_WORD_RE = re.compile(r"[\w'-]+")
+
+class RuleBasedRelevance:
+    """A page is relevant if it mentions a known place, a date or a proper noun.
+
+    Proper nouns are approximated by runs of capitalised words and by
+    capitalised words in the middle of a sentence. Needs no statistical model,
+    so it starts instantly; it finds roughly the entity-bearing pages spaCy's
+    NER would, but is not a drop-in replacement for every page.
+    """
+
+    def __init__(self, gazetteer: Optional[Set[str]] = None):
+        self.gazetteer = set(DEFAULT_GAZETTEER if gazetteer is None else gazetteer)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RuleBasedRelevance':
+        """Extend the default gazetteer with the names in a file, one per line."""
+        with open(path, 'r', encoding='utf-8') as f:
+            names = {line.strip() for line in f if line.strip()}
+        return cls(DEFAULT_GAZETTEER | names)
+
+    def load(self):
+        pass
+
+    def version(self) -> str:
+        digest = hashlib.sha1("\n".join(sorted(self.gazetteer)).encode('utf-8')).hexdigest()
+        return f"rules=1|gazetteer={digest[:12]}"
+
+    def is_relevant(self, text: str) -> bool:
+        if any(word in self.gazetteer for word in _WORD_RE.findall(text)):
+            return True
+        return bool(_DATE_RE.search(text) or
+                    _PROPER_NOUN_RUN_RE.search(text) or
+                    _MID_SENTENCE_CAPITAL_RE.search(text))
+
+    def relevant_pages(self, texts: Iterable[str]) -> Iterator[bool]:
+        for text in texts:
+            yield self.is_relevant(text)
+
+def _spacy_backend(options: ProcessingOptions) -> SpacyRelevance:
+    return SpacyRelevance(batch_size=options.nlp_batch_size)
+
+def _rules_backend(options: ProcessingOptions) -> RuleBasedRelevance:
+    if options.gazetteer_path:
+        return RuleBasedRelevance.from_file(options.gazetteer_path)
+    return RuleBasedRelevance()
+
+# Name -> factory building a backend from the processing options
+RELEVANCE_BACKENDS: Dict[str, Callable[[ProcessingOptions], object]] = {
+    "spacy": _spacy_backend,
+    "rules": _rules_backend
+}
+
+def register_relevance_backend(name: str, factory: Callable[[ProcessingOptions], object]):
+    """Make a backend selectable through ProcessingOptions.relevance_backend.
+
+    A backend provides load(), version() and relevant_pages(texts), which
+    yields one bool per text in order.
+    """
+    RELEVANCE_BACKENDS[name] = factory
+
+def create_relevance_backend(options: ProcessingOptions):
+    factory = RELEVANCE_BACKENDS.get(options.relevance_backend)
+    if factory is None:
+        raise Exception(f"Unknown relevance backend: {options.relevance_backend}")
+    return factory(options)
\ No newline at end of file
@@ -0,0 +1,35 @@
+import time
+from typing import Callable, Optional, Set, Tuple
+
+# Share of the time budget text extraction may use; the rest is left for NER and ranking
+EXTRACTION_BUDGET_SHARE = 0.6
+# Share of the budget after which NER stops following page order and checks the most promising pages first
+NER_PRIORITY_SHARE = 0.8
+
+class Deadline:
+    """Wall-clock time budget of one analysis.
+
+    Stages poll expired() between units of work and stop early once their
+    share of the budget is used up, setting partial so the result can be
+    reported as incomplete.
+    """
+
+    def __init__(self, budget_seconds: float, clock: Callable[[], float] = time.monotonic,
+                 start: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.partial = False
+        # Documents whose extraction stopped early
+        self.cut_short: Set[str] = set()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.start
+
+    def wall_clock(self) -> Tuple[float, float]:
+        """Return (budget_seconds, start) on the wall clock, to rebuild this deadline in a worker process."""
+        return self.budget_seconds, time.time() - self.elapsed()
+
+    def expired(self, share: float = 1.0) -> bool:
+        """Whether the given share of the budget has elapsed."""
+        return self.elapsed() >= self.budget_seconds * share
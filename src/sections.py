@@ -0,0 +1,134 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import ExtractedSection
+
+# Pending titles are joined into the shared buffer in chunks of this size
+_FLUSH_EVERY = 4096
+
+class SectionTable:
+    """Columnar, array-backed store of candidate sections.
+
+    Each candidate costs an interned document id, a page number and a title
+    end offset into one shared title buffer, instead of an ExtractedSection
+    object with its own dict and document string. Scores depend on the query,
+    so they are computed by the ranking code rather than stored; only the
+    sections that reach the output are materialized as ExtractedSection.
+    Rows keep insertion order, which the ranking position bias relies on.
+    Detectors that know where a section ends (layout mode) also fill the
+    optional bodies column; it stays None otherwise.
+    """
+
+    __slots__ = ('documents', '_document_ids', 'document_ids', 'page_numbers', '_title_ends', '_buffer', '_pending',
+                 'bodies')
+
+    def __init__(self):
+        self.documents: List[str] = []
+        self._document_ids: Dict[str, int] = {}
+        self.document_ids = array('i')
+        self.page_numbers = array('i')
+        self._title_ends = array('q')
+        self._buffer = ''
+        # Titles appended since the buffer was last joined
+        self._pending: List[str] = []
+        self.bodies: Optional[List[str]] = None
+
+    def _document_id(self, document: str) -> int:
+        document_id = self._document_ids.get(document)
+        if document_id is None:
+            document_id = self._document_ids[document] = len(self.documents)
+            self.documents.append(document)
+        return document_id
+
+    def append(self, document: str, page_number: int, title: str, body: Optional[str] = None):
+        if body is not None and self.bodies is None:
+            self.bodies = [''] * len(self)
+        if self.bodies is not None:
+            self.bodies.append(body or '')
+        end = self._title_ends[-1] if self._title_ends else 0
+        self.document_ids.append(self._document_id(document))
+        self.page_numbers.append(page_number)
+        self._title_ends.append(end + len(title))
+        self._pending.append(title)
+        if len(self._pending) >= _FLUSH_EVERY:
+            self._text()
+
+    def extend(self, other: 'SectionTable'):
+        """Append every row of another table, e.g. one document's candidates."""
+        if not len(other):
+            return
+        if other.bodies is not None and self.bodies is None:
+            self.bodies = [''] * len(self)
+        if self.bodies is not None:
+            self.bodies.extend(other.bodies if other.bodies is not None else [''] * len(other))
+        id_map = [self._document_id(document) for document in other.documents]
+        self.document_ids.extend(array('i', [id_map[document_id] for document_id in other.document_ids]))
+        self.page_numbers.extend(other.page_numbers)
+        offset = self._title_ends[-1] if self._title_ends else 0
+        self._title_ends.extend(array('q', [offset + end for end in other._title_ends]))
+        self._pending.append(other._text())
+
+    def take(self, indices: Iterable[int]) -> 'SectionTable':
+        """Return a new table holding the given rows, in the given order."""
+        table = SectionTable()
+        for i in indices:
+            table.append(self.documents[self.document_ids[i]], self.page_numbers[i], self.title(i),
+                         self.bodies[i] if self.bodies is not None else None)
+        return table
+
+    def _text(self) -> str:
+        if self._pending:
+            self._buffer += ''.join(self._pending)
+            self._pending = []
+        return self._buffer
+
+    def __len__(self) -> int:
+        return len(self._title_ends)
+
+    def title(self, i: int) -> str:
+        start = self._title_ends[i - 1] if i > 0 else 0
+        return self._text()[start:self._title_ends[i]]
+
+    def body(self, i: int) -> str:
+        return self.bodies[i] if self.bodies is not None else ''
+
+    def titles(self) -> Iterator[str]:
+        text = self._text()
+        start = 0
+        for end in self._title_ends:
+            yield text[start:end]
+            start = end
+
+    def rows(self) -> Iterator[Tuple[str, int, str]]:
+        """Yield (document, page_number, title) for every section."""
+        for document_id, page_number, title in zip(self.document_ids, self.page_numbers, self.titles()):
+            yield self.documents[document_id], page_number, title
+
+    def section(self, i: int, importance_rank: float = 0) -> ExtractedSection:
+        """Materialize one row as the public ExtractedSection model."""
+        return ExtractedSection(
+            document=self.documents[self.document_ids[i]],
+            section_title=self.title(i),
+            importance_rank=importance_rank,
+            page_number=self.page_numbers[i]
+        )
+
+    def __iter__(self) -> Iterator[ExtractedSection]:
+        for document, page_number, title in self.rows():
+            yield ExtractedSection(document, title, 0, page_number)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple]) -> 'SectionTable':
+        """Build a table from (document, page_number, title) or (document, page_number, title, body) rows."""
+        table = cls()
+        for row in rows:
+            table.append(*row)
+        return table
+
+    def __getstate__(self):
+        # Send one joined title buffer to worker processes
+        self._text()
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import json
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+from .config_loader import ConfigLoader
+from . import workers
+from .models import ProcessingOptions
+from .utils import analysis_to_dict, datetime_handler
+
+class RequestError(Exception):
+    """Error caused by the client's request, reported with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _is_within(path: str, directory: str) -> bool:
+    # Resolve symlinks and ".." first, so neither can escape the directory
+    real_directory = os.path.realpath(directory)
+    return os.path.commonpath([os.path.realpath(path), real_directory]) == real_directory
+
+class AnalysisService:
+    """Resident analysis service backed by a bounded pool of warmed processors.
+
+    Each worker process loads spaCy and builds its DocumentProcessor once at
+    start-up, then serves any number of requests, so per-request latency no
+    longer includes interpreter start-up, imports or model loading. When a
+    worker dies the pool is rebuilt by the request that finds it broken.
+    """
+
+    def __init__(self, options: Optional[ProcessingOptions] = None, max_workers: int = 1,
+                 default_pdf_dir: Optional[str] = None, pdf_roots: Optional[List[str]] = None):
+        self.options = options or ProcessingOptions()
+        self.default_pdf_dir = default_pdf_dir
+        # Directories a request's pdf_dir may point into; by default only the default PDF directory
+        self.pdf_roots = pdf_roots or ([default_pdf_dir] if default_pdf_dir else [])
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = self._start_pool()
+
+    def _start_pool(self):
+        executor = workers.create_pool(self.options, self.max_workers)
+        # Start the workers and load their models before the first request arrives
+        workers.warm_up(executor, self.max_workers)
+        return executor
+
+    def _restart_pool(self, broken):
+        with self._lock:
+            # Concurrent requests may all find the same pool broken; only the first replaces it
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False)
+            self._executor = self._start_pool()
+
+    def healthy(self) -> bool:
+        """Whether the worker pool can take requests."""
+        try:
+            self._executor.submit(workers.ping)
+        except BrokenProcessPool:
+            return False
+        return True
+
+    def analyse(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyse a challenge1b_input.json payload and return the analysis_output.json structure.
+
+        The PDFs are looked up in payload["pdf_dir"], falling back to the
+        service's default PDF directory. pdf_dir must lie within one of the
+        service's PDF roots and every document within pdf_dir, so a request
+        cannot read arbitrary files on the host.
+        """
+        try:
+            config = ConfigLoader.parse_input_config(payload)
+        except Exception as e:
+            raise RequestError(400, f"Invalid input configuration: {str(e)}")
+
+        pdf_dir = payload.get("pdf_dir") or self.default_pdf_dir
+        if not pdf_dir:
+            raise RequestError(400, "No PDF directory given")
+        if not any(_is_within(pdf_dir, root) for root in self.pdf_roots):
+            raise RequestError(400, f"PDF directory not allowed: {pdf_dir}")
+
+        pdf_files = [os.path.join(pdf_dir, doc.filename) for doc in config.documents]
+        for pdf_file in pdf_files:
+            if not _is_within(pdf_file, pdf_dir):
+                raise RequestError(400, f"PDF file outside the PDF directory: {pdf_file}")
+            if not os.path.exists(pdf_file):
+                raise RequestError(404, f"PDF file not found: {pdf_file}")
+
+        executor = self._executor
+        try:
+            analysis = executor.submit(
+                workers.analyse_documents, pdf_files, config.persona.role, config.job_to_be_done.task
+            ).result()
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            raise RequestError(503, "A worker process died, retry the request")
+        return analysis_to_dict(analysis, self.options.top_k)
+
+    def close(self):
+        self._executor.shutdown()
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /health and POST /analyze."""
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        if not self.server.service.healthy():
+            self._send_json(503, {"status": "unhealthy"})
+            return
+        self._send_json(200, {"status": "ok"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        # Reject instead of queueing without bound when every slot is taken
+        if not self.server.slots.acquire(blocking=False):
+            self._send_json(503, {"error": "Server busy, retry later"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length))
+            except json.JSONDecodeError:
+                raise RequestError(400, "Invalid JSON payload")
+            if not isinstance(payload, dict):
+                raise RequestError(400, "Payload must be a JSON object")
+            self._send_json(200, self.server.service.analyse(payload))
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"Error: {str(e)}"})
+        finally:
+            self.server.slots.release()
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body, indent=4, default=datetime_handler).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: AnalysisService, max_pending: int):
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+def serve(host: str, port: int, options: Optional[ProcessingOptions] = None, max_workers: int = 1,
+          default_pdf_dir: Optional[str] = None, max_pending: Optional[int] = None,
+          pdf_roots: Optional[List[str]] = None):
+    """Run the analysis HTTP server until interrupted."""
+    service = AnalysisService(options, max_workers, default_pdf_dir, pdf_roots)
+    server = AnalysisServer((host, port), service, max_pending or 4 * max_workers)
+    print(f"Serving analysis on http://{host}:{server.server_address[1]} with {max_workers} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
\ No newline at end of file
@@ -1,15 +1,17 @@
 import os
 import json
 from datetime import datetime
-from .models import DocumentAnalysis
+from typing import Dict, Any
+from .models import DocumentAnalysis, DEFAULT_TOP_K
 
-def save_analysis_to_json(analysis: DocumentAnalysis, output_path: str):
-    """Convert analysis results to JSON and save to file."""
-    
-    def datetime_handler(x):
-        if isinstance(x, datetime):
-            return x.isoformat()
-        raise TypeError(f"Object of type {type(x)} is not JSON serializable")
+def datetime_handler(x):
+    """json.dump default hook serializing datetimes as ISO 8601 strings."""
+    if isinstance(x, datetime):
+        return x.isoformat()
+    raise TypeError(f"Object of type {type(x)} is not JSON serializable")
+
+def analysis_to_dict(analysis: DocumentAnalysis, top_k: int = DEFAULT_TOP_K) -> Dict[str, Any]:
+    """Convert analysis results to the analysis_output.json structure."""
     
     # Create the output structure with limited sections
     analysis_dict = {
@@ -26,7 +28,7 @@ def save_analysis_to_json(analysis: DocumentAnalysis, output_path: str):
                 "importance_rank": i + 1,  
                 "page_number": section.page_number
             }
-            for i, section in enumerate(analysis.extracted_sections[:5])  
+            for i, section in enumerate(analysis.extracted_sections[:top_k])  
         ],
         "subsection_analysis": [
             {
@@ -34,13 +36,25 @@ def save_analysis_to_json(analysis: DocumentAnalysis, output_path: str):
                 "refined_text": subsection.refined_text,
                 "page_number": subsection.page_number
             }
-            for subsection in analysis.subsection_analysis[:5]  
+            for subsection in analysis.subsection_analysis[:top_k]  
         ]
     }
+    if analysis.metadata.partial:
+        analysis_dict["metadata"]["partial"] = True
+    return analysis_dict
+
+def save_analysis_to_json(analysis: DocumentAnalysis, output_path: str, top_k: int = DEFAULT_TOP_K):
+    """Convert analysis results to JSON and save to file."""
+    analysis_dict = analysis_to_dict(analysis, top_k)
     
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(analysis_dict, f, indent=4, default=datetime_handler)
 
+def save_profile_report(report: Dict[str, Any], output_path: str):
+    """Save a processing profile report (see Profiler.report) as JSON."""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
 def validate_pdf_path(pdf_path: str) -> bool:
     """Validate if the given path is a valid PDF file."""
     return os.path.exists(pdf_path) and pdf_path.lower().endswith('.pdf')
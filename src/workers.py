@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import List, Optional, Tuple
+from .models import ProcessingOptions, DocumentAnalysis
+from .scheduling import Deadline
+
+# Entry points executed inside worker processes. Each worker builds one
+# DocumentProcessor in its initializer (loading spaCy once when it will run
+# NER) and reuses it for every task it receives.
+_processor = None
+
+def init_worker(options: ProcessingOptions, warm: bool = True):
+    global _processor
+    from .document_processor import DocumentProcessor
+    # Workers are daemonic and cannot start a pool of their own
+    _processor = DocumentProcessor(replace(options, num_workers=1))
+    if warm:
+        _processor.load_models()
+
+def create_pool(options: ProcessingOptions, max_workers: int, warm: bool = True) -> ProcessPoolExecutor:
+    """Create a process pool whose workers each own a DocumentProcessor, with its models loaded if warm.
+
+    Pools that only extract text should not be warmed: loading spaCy would
+    only add to their start-up time and memory.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_worker,
+        initargs=(options, warm)
+    )
+
+def warm_up(pool: ProcessPoolExecutor, max_workers: int):
+    """Start the pool's workers (and load their models) ahead of the first task."""
+    for future in [pool.submit(ping) for _ in range(max_workers)]:
+        future.result()
+
+def ping() -> bool:
+    return True
+
+def _run_task(method, arg, deadline: Optional[Tuple[float, float]]):
+    # Timings travel back with the result so the parent's report covers worker time, and
+    # the documents cut short by the parent's time budget (see Deadline.wall_clock) so it
+    # can mark the result partial and keep them out of the extraction cache
+    _processor.profiler.reset()
+    if deadline is not None:
+        budget_seconds, start = deadline
+        _processor._deadline = Deadline(budget_seconds, clock=time.time, start=start)
+    try:
+        result = method(arg)
+        cut_short = sorted(_processor._deadline.cut_short) if deadline is not None else []
+    finally:
+        _processor._deadline = None
+    return result, _processor.profiler.snapshot(), cut_short
+
+def process_document(doc_path: str, deadline: Optional[Tuple[float, float]] = None):
+    return _run_task(_processor._process_document, doc_path, deadline)
+
+def extract_task(task, deadline: Optional[Tuple[float, float]] = None):
+    # A whole document or a page range of a large one, see DocumentProcessor._document_tasks
+    return _run_task(_processor._extract_task, task, deadline)
+
+def analyse_documents(document_paths: List[str], persona: str, job_to_be_done: str) -> DocumentAnalysis:
+    return _processor.process_documents(document_paths, persona, job_to_be_done)
+
+def prime_document(doc_path: str) -> None:
+    # Extract a document only for the side effect of filling the extraction cache
+    _processor.profiler.reset()
+    _processor._extract_document(doc_path)
+    if _processor.profiler.errors:
+        raise Exception(_processor.profiler.errors[0]["message"])
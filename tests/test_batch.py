@@ -0,0 +1,94 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from src.batch import load_jobs, run_batch
+from src.models import ProcessingOptions
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.work_dir, 'inputs')
+        self.output_dir = os.path.join(self.work_dir, 'outputs')
+        os.makedirs(self.input_dir)
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'input')
+        self.pdf_dir = os.path.join(data_dir, 'PDFs')
+        
+        with open(os.path.join(data_dir, 'challenge1b_input.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        for name, role in [("planner", "Travel Planner"), ("critic", "Food Critic")]:
+            with open(os.path.join(self.input_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump(dict(config, persona={"role": role}), f)
+        with open(os.path.join(self.input_dir, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("invalid json content")
+        
+    def test_load_jobs_from_directory(self):
+        jobs = load_jobs(self.input_dir, self.output_dir, self.pdf_dir)
+        
+        self.assertEqual([os.path.basename(job.input_path) for job in jobs],
+                         ["broken.json", "critic.json", "planner.json"])
+        self.assertEqual(jobs[2].output_path, os.path.join(self.output_dir, "planner_output.json"))
+        self.assertEqual(jobs[2].pdf_dir, self.pdf_dir)
+        
+    def test_load_jobs_from_manifest(self):
+        manifest_path = os.path.join(self.work_dir, "manifest.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {"input": "inputs/planner.json", "output": "custom/planner.json"},
+                {"input": "inputs/critic.json", "pdf_dir": "pdfs"}
+            ], f)
+        
+        jobs = load_jobs(manifest_path, self.output_dir, self.pdf_dir)
+        
+        self.assertEqual(jobs[0].output_path, os.path.join(self.work_dir, "custom", "planner.json"))
+        self.assertEqual(jobs[0].pdf_dir, self.pdf_dir)
+        self.assertEqual(jobs[1].output_path, os.path.join(self.output_dir, "critic_output.json"))
+        self.assertEqual(jobs[1].pdf_dir, os.path.join(self.work_dir, "pdfs"))
+        
+    def test_run_batch_continues_past_failures(self):
+        jobs = load_jobs(self.input_dir, self.output_dir, self.pdf_dir)
+        summary_path = os.path.join(self.work_dir, "summary.json")
+        
+        results = run_batch(jobs, ProcessingOptions(), max_workers=2, summary_path=summary_path)
+        
+        self.assertEqual([result.succeeded for result in results], [False, True, True])
+        self.assertIn("Invalid JSON", results[0].error)
+        
+        with open(os.path.join(self.output_dir, "critic_output.json"), 'r') as f:
+            self.assertEqual(json.load(f)["metadata"]["persona"], "Food Critic")
+        with open(os.path.join(self.output_dir, "planner_output.json"), 'r') as f:
+            self.assertEqual(len(json.load(f)["extracted_sections"]), 5)
+        
+        with open(summary_path, 'r') as f:
+            summary = json.load(f)
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["distinct_documents"], 7)
+        
+    def test_run_batch_fails_jobs_of_unreadable_documents(self):
+        pdf_dir = os.path.join(self.work_dir, "pdfs")
+        os.makedirs(pdf_dir)
+        with open(os.path.join(pdf_dir, "corrupt.pdf"), 'w') as f:
+            f.write("not a pdf")
+        with open(os.path.join(self.input_dir, "planner.json"), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        with open(os.path.join(self.input_dir, "corrupt.json"), 'w', encoding='utf-8') as f:
+            json.dump(dict(config, documents=[{"filename": "corrupt.pdf", "title": "Corrupt"}]), f)
+        manifest_path = os.path.join(self.work_dir, "manifest.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                {"input": "inputs/corrupt.json", "pdf_dir": "pdfs"},
+                {"input": "inputs/planner.json"}
+            ], f)
+        
+        results = run_batch(load_jobs(manifest_path, self.output_dir, self.pdf_dir), ProcessingOptions(), max_workers=2)
+        
+        self.assertEqual([result.succeeded for result in results], [False, True])
+        self.assertIn("corrupt.pdf", results[0].error)
+        
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from datetime import datetime
+from src.cache import ExtractionCache, ResultCache
+from src.models import DocumentAnalysis, Metadata, SubsectionAnalysis
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.data_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.data_dir, "doc.pdf")
+        with open(self.pdf_path, 'wb') as f:
+            f.write(b"%PDF-1.4 dummy content")
+        
+    def test_round_trip(self):
+        cache = ExtractionCache(self.cache_dir)
+        key = cache.key(self.pdf_path, "v1")
+        entry = {"pages": ["Page one", "Page two"], "sections": [[1, "Title"]]}
+        
+        self.assertIsNone(cache.get(key))
+        cache.put(key, entry)
+        self.assertEqual(cache.get(key), entry)
+        
+        # A fresh cache over the same directory sees the persisted entry
+        self.assertEqual(ExtractionCache(self.cache_dir).get(key), entry)
+        
+    def test_key_depends_on_content_and_namespace(self):
+        cache = ExtractionCache(self.cache_dir)
+        key = cache.key(self.pdf_path, "v1")
+        
+        # Same content under another name hits the same key
+        copy_path = os.path.join(self.data_dir, "copy.pdf")
+        shutil.copy(self.pdf_path, copy_path)
+        self.assertEqual(cache.key(copy_path, "v1"), key)
+        
+        # Different library/model versions miss
+        self.assertNotEqual(cache.key(self.pdf_path, "v2"), key)
+        
+        # Changed content misses
+        with open(self.pdf_path, 'ab') as f:
+            f.write(b" more")
+        self.assertNotEqual(cache.key(self.pdf_path, "v1"), key)
+        
+    def test_key_from_bytes_in_memory(self):
+        with open(self.pdf_path, 'rb') as f:
+            data = f.read()
+        self.assertEqual(ExtractionCache(self.cache_dir).key(self.pdf_path, "v1", data),
+                         ExtractionCache(self.cache_dir).key(self.pdf_path, "v1"))
+        
+    def test_lru_eviction(self):
+        entry = {"pages": ["x" * 100], "sections": []}
+        cache = ExtractionCache(self.cache_dir, max_bytes=350)
+        
+        cache.put("a", entry)
+        time.sleep(0.01)
+        cache.put("b", entry)
+        time.sleep(0.01)
+        cache.get("a")  # "a" becomes the most recently used entry
+        time.sleep(0.01)
+        cache.put("c", entry)
+        
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.data_dir)
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.paths = []
+        for name in ("a.pdf", "b.pdf"):
+            path = os.path.join(self.data_dir, name)
+            with open(path, 'wb') as f:
+                f.write(name.encode())
+            self.paths.append(path)
+        
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        
+    def analysis(self, text: str = "text") -> DocumentAnalysis:
+        metadata = Metadata(["a.pdf"], "Travel Planner", "Plan a trip", datetime.now())
+        return DocumentAnalysis(metadata, [], [SubsectionAnalysis("a.pdf", text, 1)])
+        
+    def test_key_normalizes_query(self):
+        cache = ResultCache()
+        key, digests = cache.key(self.paths, "Travel Planner", "Plan a trip", 5)
+        self.assertEqual(cache.key(self.paths, " travel  planner", "PLAN a trip ", 5)[0], key)
+        self.assertNotEqual(cache.key(self.paths, "Travel Planner", "Plan a trip", 3)[0], key)
+        self.assertNotEqual(cache.key(self.paths[:1], "Travel Planner", "Plan a trip", 5)[0], key)
+        self.assertEqual(len(digests), 2)
+        
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for name in ("a", "b"):
+            cache.put(name, frozenset(), self.analysis())
+        cache.get("a")  # "a" becomes the most recently used entry
+        cache.put("c", frozenset(), self.analysis())
+        
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        
+        # The byte limit evicts as well, and oversized analyses are not kept
+        cache = ResultCache(max_bytes=1000)
+        cache.put("a", frozenset(), self.analysis("x" * 400))
+        cache.put("b", frozenset(), self.analysis("x" * 400))
+        self.assertEqual(len(cache), 1)
+        cache.put("c", frozenset(), self.analysis("x" * 2000))
+        self.assertIsNone(cache.get("c"))
+        self.assertLessEqual(cache.bytes, 1000)
+        
+    def test_changed_document_invalidates(self):
+        cache = ResultCache()
+        key, digests = cache.key(self.paths, "Travel Planner", "Plan a trip", 5)
+        cache.put(key, digests, self.analysis())
+        other_key, other_digests = cache.key(self.paths[1:], "Travel Planner", "Plan a trip", 5)
+        cache.put(other_key, other_digests, self.analysis())
+        
+        with open(self.paths[0], 'ab') as f:
+            f.write(b" changed")
+        new_key, _ = cache.key(self.paths, "Travel Planner", "Plan a trip", 5)
+        
+        self.assertNotEqual(new_key, key)
+        self.assertIsNone(cache.get(key))
+        # Entries that do not use the changed document survive
+        self.assertIsNotNone(cache.get(other_key))
+        self.assertEqual(cache.invalidations, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from src.dedup import DuplicateIndex, MinHasher, shingles, unique_indices
+
+TEXT = ("Marseille, founded by Greek sailors around 600 BC, is the oldest city in France. Its strategic "
+        "location on the Mediterranean coast made it a vital trading port, and its rich cultural heritage "
+        "is reflected in its diverse architecture, its markets and the Old Port at the heart of the city.")
+
+class TestDedup(unittest.TestCase):
+    def test_minhash_estimates_similarity(self):
+        hasher = MinHasher()
+        signature = hasher.signature(shingles(TEXT.lower()))
+        self.assertTrue((hasher.signature(shingles(TEXT.lower())) == signature).all())
+        other = hasher.signature(shingles("a completely different page about packing sunscreen and hats for the beach"))
+        self.assertLess((other == signature).mean(), 0.2)
+        
+    def test_duplicate_index(self):
+        index = DuplicateIndex()
+        self.assertIsNone(index.add(0, TEXT))
+        self.assertIsNone(index.add(1, "Packing tips for a summer trip: sunscreen, hats and light clothing."))
+        # Exact after normalization
+        self.assertEqual(index.add(2, "  " + TEXT.upper()), 0)
+        # One word changed
+        self.assertEqual(index.add(3, TEXT.replace("vital", "key")), 0)
+        self.assertIsNone(index.add(4, "   "))
+        self.assertIsNone(index.add(5, "Nice: the jewel of the French Riviera, with its promenade and markets."))
+        
+    def test_unique_indices(self):
+        titles = ["Introduction", "Travel Tips", "introduction ", "Conclusion", "Travel  tips"]
+        self.assertEqual(unique_indices(titles), [0, 1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 import unittest
 import os
+import glob
+import shutil
+import tempfile
 from src.document_processor import DocumentProcessor
-from src.models import ExtractedSection, SubsectionAnalysis
+from src.models import ExtractedSection, SubsectionAnalysis, ProcessingOptions
+from src.scheduling import Deadline
+from src.sections import SectionTable
 
 class TestDocumentProcessor(unittest.TestCase):
     def setUp(self):
@@ -10,6 +15,9 @@ class TestDocumentProcessor(unittest.TestCase):
             os.path.dirname(__file__),
             'test_data'
         )
+        self.pdf_paths = sorted(glob.glob(os.path.join(
+            os.path.dirname(__file__), '..', 'data', 'input', 'PDFs', '*.pdf'
+        )))
         
     def test_is_section_title(self):
         # Test valid section titles
@@ -56,6 +64,144 @@ class TestDocumentProcessor(unittest.TestCase):
         self.assertEqual(ranked[1].section_title, "Travel Tips")
         self.assertEqual(ranked[2].section_title, "Planning Guide")
         
+    def test_models_loaded_on_first_use(self):
+        processor = DocumentProcessor()
+        self.assertIsNone(processor.relevance._nlp)
+        processor._refine_text("Line 1\nLine 2")
+        self.assertIsNone(processor.relevance._nlp)
+        processor._is_relevant_page("Paris is the capital of France.")
+        self.assertIsNotNone(processor.relevance._nlp)
+        
+    def test_rules_relevance_backend(self):
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules"))
+        self.assertTrue(processor._is_relevant_page("Paris is the capital of France."))
+        self.assertFalse(processor._is_relevant_page("This is a simple text without any entities."))
+        
+        analysis = processor.process_documents(self.pdf_paths, "Travel Planner", "Plan a trip")
+        self.assertEqual(len(analysis.subsection_analysis), 5)
+        
+    def test_time_budget(self):
+        args = (self.pdf_paths[:2], "Travel Planner", "Plan a trip")
+        expected = DocumentProcessor(ProcessingOptions(relevance_backend="rules")).process_documents(*args)
+        
+        # A generous budget changes nothing
+        analysis = DocumentProcessor(ProcessingOptions(relevance_backend="rules", time_budget=600)).process_documents(*args)
+        self.assertFalse(analysis.metadata.partial)
+        self.assertEqual(analysis.extracted_sections, expected.extracted_sections)
+        self.assertEqual(analysis.subsection_analysis, expected.subsection_analysis)
+        
+        # An exhausted one returns what was found so far
+        analysis = DocumentProcessor(ProcessingOptions(relevance_backend="rules", time_budget=0)).process_documents(*args)
+        self.assertTrue(analysis.metadata.partial)
+        self.assertEqual(analysis.extracted_sections, [])
+        
+    def test_time_budget_workers(self):
+        options = ProcessingOptions(relevance_backend="rules", num_workers=2, split_pages_threshold=2, time_budget=0)
+        with DocumentProcessor(options) as processor:
+            analysis = processor.process_documents(self.pdf_paths, "Travel Planner", "Plan a trip")
+            
+            # Workers stop at the parent's deadline instead of extracting everything
+            self.assertTrue(analysis.metadata.partial)
+            self.assertEqual(analysis.extracted_sections, [])
+            self.assertGreater(processor.profiler.counters.get("pages_skipped", 0), 0)
+        
+    def test_extractive_refinement(self):
+        args = (self.pdf_paths[:2], "Travel Planner", "Plan a trip")
+        pages = DocumentProcessor(ProcessingOptions(relevance_backend="rules")).process_documents(*args)
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules", refinement="extractive",
+                                                        refined_max_chars=300))
+        analysis = processor.process_documents(*args)
+        
+        # Same pages, shorter passages taken from them
+        self.assertEqual([s.page_number for s in analysis.subsection_analysis],
+                         [s.page_number for s in pages.subsection_analysis])
+        for subsection, page in zip(analysis.subsection_analysis, pages.subsection_analysis):
+            self.assertLessEqual(len(subsection.refined_text), 300)
+            self.assertLessEqual(set(subsection.refined_text.split()), set(page.refined_text.split()))
+        # Only the reported pages are refined
+        self.assertEqual(processor.profiler.stages["refine_text"]["calls"], len(analysis.subsection_analysis))
+        
+    def test_result_cache(self):
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules", result_cache_entries=4))
+        first = processor.process_documents(self.pdf_paths[:2], "Travel Planner", "Plan a trip")
+        again = processor.process_documents(self.pdf_paths[:2], "travel planner ", "Plan a  trip")
+        
+        self.assertEqual(processor.profiler.counters["result_cache_hits"], 1)
+        self.assertEqual(again.extracted_sections, first.extracted_sections)
+        self.assertEqual(again.subsection_analysis, first.subsection_analysis)
+        # Metadata describes the new request
+        self.assertEqual(again.metadata.persona, "travel planner ")
+        self.assertGreaterEqual(again.metadata.processing_timestamp, first.metadata.processing_timestamp)
+        
+        processor.process_documents(self.pdf_paths[:2], "Travel Planner", "Visit museums")
+        self.assertEqual(processor.results.stats()["misses"], 2)
+        
+    def test_dedup(self):
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules", dedup=True, lazy_relevance=False))
+        # The same PDF twice: its second copy is collapsed
+        analysis = processor.process_documents(self.pdf_paths[:1] * 2, "Travel Planner", "Plan a trip", top_k=100)
+        
+        titles = [section.section_title.lower() for section in analysis.extracted_sections]
+        self.assertEqual(len(titles), len(set(titles)))
+        texts = [subsection.refined_text for subsection in analysis.subsection_analysis]
+        self.assertEqual(len(texts), len(set(texts)))
+        self.assertEqual(processor.profiler.counters["duplicate_pages"], processor.profiler.counters["pages"] // 2)
+        
+        with self.assertRaises(Exception):
+            DocumentProcessor(ProcessingOptions(dedup=True, streaming=True))
+        
+    def test_scheduled_relevance(self):
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules"))
+        pages = [
+            ("a.pdf", 1, "Nothing to see here."),
+            ("a.pdf", 2, "Plan a trip to Nice."),
+            ("a.pdf", 3, "A museum in Paris.")
+        ]
+        
+        processor._deadline = Deadline(600)
+        self.assertEqual(list(processor._scheduled_relevance(pages, None, {"trip"})), [False, True, True])
+        self.assertFalse(processor._deadline.partial)
+        
+        # Close to the deadline, the unchecked page matching the query is checked first
+        now = [0.0]
+        processor._deadline = Deadline(10, clock=lambda: now[0])
+        now[0] = 9.0
+        self.assertEqual(list(processor._scheduled_relevance(pages, 1, {"trip"})), [False, True, False])
+        self.assertTrue(processor._deadline.partial)
+        
+        # Out of time, nothing is checked
+        now[0] = 10.0
+        self.assertEqual(list(processor._scheduled_relevance(pages, 1, {"trip"})), [False, False, False])
+        
+    def test_scheduled_relevance_generous_budget(self):
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules"))
+        pages = [("a.pdf", i, "A museum in Paris." if i < 3 else "Plan a trip.") for i in range(20)]
+        
+        processor.profiler.reset()
+        expected = processor._select_relevant_pages(pages, 2)
+        ner_pages = processor.profiler.counters["ner_pages"]
+        
+        # Pages checked in page order stop as early as without a budget
+        processor.profiler.reset()
+        processor._deadline = Deadline(600)
+        relevance = processor._scheduled_relevance(pages, 2, {"trip"})
+        self.assertEqual(processor._select_relevant_pages(pages, 2, relevance=relevance), expected)
+        self.assertEqual(processor.profiler.counters["ner_pages"], ner_pages)
+        self.assertFalse(processor._deadline.partial)
+        
+    def test_rank_section_table(self):
+        sections = [
+            ExtractedSection("doc1.pdf", "Travel Tips", 0, 1),
+            ExtractedSection("doc1.pdf", "History", 0, 2),
+            ExtractedSection("doc2.pdf", "Planning Guide", 0, 3),
+            ExtractedSection("doc2.pdf", "Travel Tips", 0, 4)
+        ]
+        table = SectionTable.from_rows((s.document, s.page_number, s.section_title) for s in sections)
+        
+        expected = self.processor._rank_sections(sections, "Travel Planner", "Plan a trip")
+        self.assertEqual(self.processor._rank_sections(table, "Travel Planner", "Plan a trip"), expected)
+        self.assertEqual(self.processor._rank_sections(table, "Travel Planner", "Plan a trip", top_k=2), expected[:2])
+        
     def test_is_relevant_page(self):
         # Test page with named entities
         text_with_entities = "Paris is the capital of France. The Eiffel Tower is beautiful."
@@ -65,6 +211,61 @@ class TestDocumentProcessor(unittest.TestCase):
         text_without_entities = "The weather was nice that day."
         self.assertFalse(self.processor._is_relevant_page(text_without_entities))
     
+    def test_relevant_pages_batched(self):
+        texts = [
+            "Paris is the capital of France. The Eiffel Tower is beautiful.",
+            "The weather was nice that day.",
+            "Marseille is a port city on the Mediterranean."
+        ]
+        expected = [self.processor._is_relevant_page(text) for text in texts]
+        self.assertEqual(list(self.processor._relevant_pages(texts)), expected)
+        self.assertEqual(expected[:2], [True, False])
+    
+    def test_mmap_extraction_matches_path(self):
+        mapped = DocumentProcessor(ProcessingOptions(mmap_pdfs=True))
+        by_path = DocumentProcessor(ProcessingOptions(mmap_pdfs=False))
+        for pdf_path in self.pdf_paths[:2]:
+            sections, pages = mapped._extract_document(pdf_path)
+            expected_sections, expected_pages = by_path._extract_document(pdf_path)
+            self.assertEqual(list(sections.rows()), list(expected_sections.rows()))
+            self.assertEqual(pages, expected_pages)
+        
+    def test_prefetch_matches_direct_reads(self):
+        prefetching = DocumentProcessor(ProcessingOptions(prefetch_depth=2))
+        extracted = list(prefetching._extract_documents(self.pdf_paths))
+        expected = list(self.processor._extract_documents(self.pdf_paths))
+        self.assertEqual([pages for _, pages in extracted], [pages for _, pages in expected])
+        self.assertEqual(prefetching.profiler.counters["prefetch_hits"], len(self.pdf_paths))
+        self.assertIsNone(prefetching._prefetcher)
+        
+    def test_prefetch_with_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            options = ProcessingOptions(prefetch_depth=2, cache_dir=cache_dir)
+            expected = list(self.processor._extract_documents(self.pdf_paths))
+            for prefetch_hits in (len(self.pdf_paths), 0):
+                # Cache keys hash the prefetched bytes; cache hits leave them unused
+                processor = DocumentProcessor(options)
+                extracted = list(processor._extract_documents(self.pdf_paths))
+                self.assertEqual([pages for _, pages in extracted], [pages for _, pages in expected])
+                self.assertEqual(processor.profiler.counters.get("prefetch_hits", 0), prefetch_hits)
+        finally:
+            shutil.rmtree(cache_dir)
+        
+    def test_layout_headings(self):
+        by_layout = DocumentProcessor(ProcessingOptions(heading_detection="layout"))
+        for pdf_path in self.pdf_paths[:2]:
+            sections, pages = by_layout._extract_document(pdf_path)
+            text_sections, text_pages = self.processor._extract_document(pdf_path)
+            # Same page text from one dict pass, far fewer candidates
+            self.assertEqual(pages, text_pages)
+            self.assertGreater(len(sections), 0)
+            self.assertLess(len(sections), len(text_sections) / 2)
+            self.assertEqual(len(sections.bodies), len(sections))
+        
+        with self.assertRaises(Exception):
+            DocumentProcessor(ProcessingOptions(heading_detection="layout", streaming=True))
+        
     def test_extract_sections(self):
         test_text = """Introduction
         This is introduction text.
@@ -82,5 +283,118 @@ class TestDocumentProcessor(unittest.TestCase):
         self.assertEqual(sections[1].section_title, "Chapter 1: Getting Started")
         self.assertEqual(sections[2].section_title, "Summary")
 
+    def test_parallel_matches_sequential(self):
+        persona = "Travel Planner"
+        job = "Plan a trip of 4 days for a group of 10 college friends."
+        
+        sequential = self.processor.process_documents(self.pdf_paths, persona, job)
+        with DocumentProcessor(ProcessingOptions(num_workers=2)) as parallel_processor:
+            parallel = parallel_processor.process_documents(self.pdf_paths, persona, job)
+        
+        self.assertEqual(parallel.extracted_sections, sequential.extracted_sections)
+        self.assertEqual(parallel.subsection_analysis, sequential.subsection_analysis)
+
+    def test_page_range_split_matches_whole(self):
+        persona = "Travel Planner"
+        job = "Plan a trip of 4 days for a group of 10 college friends."
+        options = ProcessingOptions(num_workers=2, split_pages_threshold=4)
+        
+        with DocumentProcessor(options) as split_processor:
+            tasks = split_processor._document_tasks(self.pdf_paths[0])
+            self.assertGreater(len(tasks), 1)
+            self.assertEqual(tasks[0][1], 0)
+            for (_, _, stop), (_, start, _) in zip(tasks, tasks[1:]):
+                self.assertEqual(stop, start)
+            
+            # A single large document is split too
+            for paths in (self.pdf_paths[:1], self.pdf_paths):
+                split = split_processor.process_documents(paths, persona, job)
+                whole = self.processor.process_documents(paths, persona, job)
+                self.assertEqual(split.extracted_sections, whole.extracted_sections)
+                self.assertEqual(split.subsection_analysis, whole.subsection_analysis)
+    
+    def test_small_documents_not_opened_for_splitting(self):
+        with DocumentProcessor(ProcessingOptions(num_workers=2, split_pages_threshold=1000)) as processor:
+            self.assertEqual(processor._document_tasks(self.pdf_paths[0]), [(self.pdf_paths[0], 0, None)])
+            # Too small to have that many pages of text, so not even opened
+            self.assertNotIn("open_pdf", processor.profiler.stages)
+    
+    def test_lazy_relevance_matches_eager(self):
+        persona = "Travel Planner"
+        job = "Plan a trip of 4 days for a group of 10 college friends."
+        
+        eager_processor = DocumentProcessor(ProcessingOptions(lazy_relevance=False))
+        for top_k in (1, 5, 20):
+            lazy = self.processor.process_documents(self.pdf_paths, persona, job, top_k=top_k)
+            eager = eager_processor.process_documents(self.pdf_paths, persona, job, top_k=top_k)
+            
+            self.assertEqual(lazy.extracted_sections, eager.extracted_sections)
+            self.assertEqual(lazy.subsection_analysis, eager.subsection_analysis)
+            self.assertLessEqual(len(lazy.subsection_analysis), top_k)
+
+    def test_streaming_matches_default(self):
+        persona = "Travel Planner"
+        job = "Plan a trip of 4 days for a group of 10 college friends."
+        
+        streaming_processor = DocumentProcessor(ProcessingOptions(streaming=True, nlp_batch_size=4))
+        for top_k in (1, 5, 50):
+            default = self.processor.process_documents(self.pdf_paths, persona, job, top_k=top_k)
+            streamed = streaming_processor.process_documents(self.pdf_paths, persona, job, top_k=top_k)
+            
+            self.assertEqual(streamed.extracted_sections, default.extracted_sections)
+            self.assertEqual(streamed.subsection_analysis, default.subsection_analysis)
+    
+    def test_profiler_report(self):
+        self.processor.process_documents(self.pdf_paths, "Travel Planner", "Plan a trip")
+        report = self.processor.profiler.report()
+        
+        self.assertEqual(len(report["documents"]), len(self.pdf_paths))
+        self.assertEqual(
+            report["counters"]["pages"],
+            sum(data["counters"]["pages"] for data in report["documents"].values())
+        )
+        for stage in ("open_pdf", "get_text", "extract_sections", "relevance_ner", "rank_sections"):
+            self.assertIn(stage, report["stages"])
+    
+    def test_extraction_cache_warm_run(self):
+        persona = "Travel Planner"
+        job = "Plan a trip of 4 days for a group of 10 college friends."
+        cache_dir = tempfile.mkdtemp()
+        try:
+            options = ProcessingOptions(cache_dir=cache_dir)
+            cold = DocumentProcessor(options).process_documents(self.pdf_paths, persona, job)
+            self.assertTrue(os.listdir(cache_dir))
+            
+            warm = DocumentProcessor(options).process_documents(self.pdf_paths, persona, job)
+            self.assertEqual(warm.extracted_sections, cold.extracted_sections)
+            self.assertEqual(warm.subsection_analysis, cold.subsection_analysis)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_bm25_ranking(self):
+        processor = DocumentProcessor(ProcessingOptions(ranking="bm25"))
+        sections = [
+            ExtractedSection("doc1.pdf", "Local Cuisine", 0, 1),
+            ExtractedSection("doc1.pdf", "Travel Planner's Notes", 0, 2),
+            ExtractedSection("doc1.pdf", "History", 0, 3),
+            ExtractedSection("doc2.pdf", "Travel Planner's Notes", 0, 4)
+        ]
+        
+        ranked = processor._rank_sections(sections, "Travel Planner", "Plan a trip")
+        
+        # No position bias: identical titles score the same wherever they appear
+        self.assertEqual([section.page_number for section in ranked[:2]], [2, 4])
+        self.assertEqual(ranked[0].importance_rank, ranked[1].importance_rank)
+        self.assertEqual(processor._rank_sections(sections, "Travel Planner", "Plan a trip", top_k=1), ranked[:1])
+        
+        analysis = processor.process_documents(self.pdf_paths, "Travel Planner", "Plan a trip", top_k=3)
+        self.assertEqual(len(analysis.extracted_sections), 3)
+        
+        text = "Intro line.\nTravel Tips\nPack light.\n\nbook early.\nHistory\n"
+        self.assertEqual(processor._section_bodies([("doc1.pdf", 1, text)]), ["Pack light. book early.", ""])
+        
+        with self.assertRaises(Exception):
+            DocumentProcessor(ProcessingOptions(ranking="bm25", streaming=True))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
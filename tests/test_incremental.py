@@ -0,0 +1,108 @@
+import os
+import glob
+import shutil
+import tempfile
+import unittest
+from src.document_processor import DocumentProcessor
+from src.incremental import IncrementalAnalyzer, collection_signature, watch
+from src.models import ProcessingOptions
+
+class TestIncrementalAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        pdf_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'input', 'PDFs')
+        self.pdf_paths = []
+        for path in sorted(glob.glob(os.path.join(pdf_dir, '*.pdf')))[:4]:
+            self.pdf_paths.append(shutil.copy(path, self.work_dir))
+        self.manifest_path = os.path.join(self.work_dir, 'manifest.json')
+        # The rule-based relevance backend keeps these tests independent of the spaCy model
+        self.options = ProcessingOptions(relevance_backend="rules")
+        self.persona = "Travel Planner"
+        self.job = "Plan a trip of 4 days for a group of 10 college friends."
+        
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+        
+    def analyse(self, paths):
+        analyzer = IncrementalAnalyzer(DocumentProcessor(self.options), self.manifest_path)
+        analysis = analyzer.analyse(paths, self.persona, self.job)
+        expected = DocumentProcessor(self.options).process_documents(paths, self.persona, self.job)
+        self.assertEqual(analysis.extracted_sections, expected.extracted_sections)
+        self.assertEqual(analysis.subsection_analysis, expected.subsection_analysis)
+        return analyzer.processor.profiler.counters
+        
+    def test_only_changes_are_extracted(self):
+        counters = self.analyse(self.pdf_paths)
+        self.assertEqual(counters["documents_extracted"], 4)
+        
+        counters = self.analyse(self.pdf_paths)
+        self.assertEqual(counters.get("documents_extracted", 0), 0)
+        self.assertEqual(counters["documents_reused"], 4)
+        
+        # Touched files are re-hashed, not re-extracted
+        os.utime(self.pdf_paths[0], ns=(0, 0))
+        counters = self.analyse(self.pdf_paths)
+        self.assertEqual(counters.get("documents_extracted", 0), 0)
+        
+        counters = self.analyse(self.pdf_paths[1:])
+        self.assertEqual(counters["documents_removed"], 1)
+        
+        counters = self.analyse(self.pdf_paths[1:] + self.pdf_paths[:1])
+        self.assertEqual(counters["documents_extracted"], 1)
+        self.assertEqual(counters["documents_reused"], 3)
+        
+    def test_modified_document_is_extracted_again(self):
+        self.analyse(self.pdf_paths)
+        shutil.copy(self.pdf_paths[1], self.pdf_paths[0])
+        
+        counters = self.analyse(self.pdf_paths)
+        self.assertEqual(counters["documents_extracted"], 1)
+        
+    def test_manifest_from_other_detector_is_ignored(self):
+        self.analyse(self.pdf_paths)
+        self.assertTrue(IncrementalAnalyzer(DocumentProcessor(self.options), self.manifest_path).documents)
+        
+        gazetteer_path = os.path.join(self.work_dir, 'gazetteer.txt')
+        with open(gazetteer_path, 'w', encoding='utf-8') as f:
+            f.write("Gordes\n")
+        processor = DocumentProcessor(ProcessingOptions(relevance_backend="rules", gazetteer_path=gazetteer_path))
+        self.assertEqual(IncrementalAnalyzer(processor, self.manifest_path).documents, {})
+
+    def test_time_budget(self):
+        options = ProcessingOptions(relevance_backend="rules", time_budget=0)
+        analysis = IncrementalAnalyzer(DocumentProcessor(options), self.manifest_path).analyse(
+            self.pdf_paths, self.persona, self.job)
+        self.assertTrue(analysis.metadata.partial)
+        
+        # Documents cut short are extracted again, in full, once there is time
+        counters = self.analyse(self.pdf_paths)
+        self.assertEqual(counters["documents_extracted"], 4)
+        
+    def test_unsupported_options(self):
+        for options in (ProcessingOptions(relevance_backend="rules", streaming=True),
+                        ProcessingOptions(relevance_backend="rules", result_cache_entries=4)):
+            with self.assertRaises(Exception):
+                IncrementalAnalyzer(DocumentProcessor(options), self.manifest_path)
+
+class TestWatch(unittest.TestCase):
+    def test_runs_on_change(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            path = f.name
+        try:
+            runs = []
+            
+            def run():
+                runs.append(collection_signature([path]))
+                # Modify the watched file after the first run only
+                if len(runs) == 1:
+                    with open(path, 'w') as out:
+                        out.write("changed")
+            
+            watch(run, lambda: [path], interval=0.01, max_runs=2)
+            self.assertEqual(len(runs), 2)
+            self.assertNotEqual(runs[0], runs[1])
+        finally:
+            os.unlink(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from src import layout
+
+def span(text, size=10.0, bold=False):
+    return {"text": text, "size": size, "flags": layout.BOLD_FLAG if bold else 0, "font": "Helvetica"}
+
+def block(*lines):
+    return {"lines": [{"spans": spans} for spans in lines]}
+
+class TestLayout(unittest.TestCase):
+    def setUp(self):
+        self.pages = [
+            (1, layout.page_lines({"blocks": [
+                block([span("Guide to the", 16.0)], [span("Riviera", 16.0)]),
+                block([span("Welcome to the coast. ")], [span("Enjoy your stay. ")]),
+                block([span("Best Time", bold=True), span(": spring and autumn. ")])
+            ]})),
+            (2, layout.page_lines({"blocks": [
+                block([span("Beaches", bold=True)], [span("The sand is soft ")]),
+                block([span("and warm. ")], [span("12")]),
+                block([span("Markets")]),
+                block([span("Open every morning. ")], [span("Stalls sell cheese. ")])
+            ]}))
+        ]
+        
+    def test_page_lines(self):
+        lines = self.pages[0][1]
+        self.assertEqual(layout.page_text(lines),
+                         "Guide to the\nRiviera\nWelcome to the coast. \nEnjoy your stay. \nBest Time: spring and autumn. \n")
+        # A line is only bold when all its visible spans are
+        self.assertFalse(lines[-1].bold)
+        self.assertEqual(lines[0].size, 16.0)
+        
+    def test_body_style(self):
+        self.assertEqual(layout.body_style(self.pages), (10.0, False))
+        
+    def test_detect_headings(self):
+        self.assertEqual(layout.detect_headings(self.pages), [
+            (1, "Guide to the Riviera",
+             "Welcome to the coast. Enjoy your stay. Best Time: spring and autumn."),
+            (2, "Beaches", "The sand is soft and warm. 12"),
+            (2, "Markets", "Open every morning. Stalls sell cheese.")
+        ])
+        
+    def test_no_text(self):
+        self.assertEqual(layout.detect_headings([(1, [])]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.prefetch import Prefetcher
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = []
+        for i, size in enumerate([10, 20, 30, 1000]):
+            path = os.path.join(self.temp_dir, f"doc{i}.pdf")
+            with open(path, 'wb') as f:
+                f.write(bytes([i]) * size)
+            self.paths.append(path)
+        
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        
+    def test_reads_ahead_in_order(self):
+        prefetcher = Prefetcher(self.paths, depth=2, max_bytes=100)
+        self.assertEqual(prefetcher.buffered_bytes, 30)
+        self.assertEqual(prefetcher.take(self.paths[0]), bytes([0]) * 10)
+        # doc2 joins the read-ahead; doc3 is over the cap and read directly
+        self.assertEqual(prefetcher.buffered_bytes, 50)
+        self.assertEqual(prefetcher.take(self.paths[1]), bytes([1]) * 20)
+        self.assertEqual(prefetcher.take(self.paths[2]), bytes([2]) * 30)
+        self.assertIsNone(prefetcher.take(self.paths[3]))
+        self.assertEqual(prefetcher.buffered_bytes, 0)
+        prefetcher.close()
+        
+    def test_peek_keeps_bytes(self):
+        prefetcher = Prefetcher(self.paths, depth=1, max_bytes=100)
+        self.assertEqual(prefetcher.peek(self.paths[0]), bytes([0]) * 10)
+        self.assertEqual(prefetcher.take(self.paths[0]), bytes([0]) * 10)
+        # doc1 was served elsewhere; peeking at doc2 drops it and reads doc2
+        self.assertEqual(prefetcher.peek(self.paths[2]), bytes([2]) * 30)
+        self.assertEqual(prefetcher.buffered_bytes, 30)
+        self.assertEqual(prefetcher.take(self.paths[2]), bytes([2]) * 30)
+        # Over the cap, left to be read directly
+        self.assertIsNone(prefetcher.peek(self.paths[3]))
+        prefetcher.close()
+        
+    def test_skipped_documents_are_dropped(self):
+        prefetcher = Prefetcher(self.paths[:3] + ["missing.pdf"], depth=1, max_bytes=100)
+        # doc0 was served elsewhere, e.g. from a cache; doc1 was not read ahead yet
+        self.assertIsNone(prefetcher.take(self.paths[1]))
+        self.assertEqual(prefetcher.buffered_bytes, 30)
+        self.assertEqual(prefetcher.take(self.paths[2]), bytes([2]) * 30)
+        self.assertIsNone(prefetcher.take("missing.pdf"))
+        self.assertIsNone(prefetcher.take("unknown.pdf"))
+        prefetcher.close()
+        self.assertEqual(prefetcher.buffered_bytes, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import time
+from src.profiling import Profiler
+
+class TestProfiler(unittest.TestCase):
+    def test_stage_timing(self):
+        profiler = Profiler()
+        with profiler.stage("get_text", "a.pdf"):
+            time.sleep(0.01)
+        with profiler.stage("get_text", "b.pdf"):
+            pass
+        
+        stats = profiler.stages["get_text"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertGreaterEqual(stats["wall_seconds"], 0.01)
+        self.assertEqual(profiler.documents["a.pdf"]["stages"]["get_text"]["calls"], 1)
+        
+    def test_stage_records_time_on_error(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage("open_pdf"):
+                raise ValueError("broken")
+        self.assertEqual(profiler.stages["open_pdf"]["calls"], 1)
+        
+    def test_counters_and_errors(self):
+        profiler = Profiler()
+        profiler.count("pages", 3, document="a.pdf")
+        profiler.count("pages", document="b.pdf")
+        profiler.error("cannot open", "c.pdf")
+        
+        self.assertEqual(profiler.counters["pages"], 4)
+        self.assertEqual(profiler.documents["a.pdf"]["counters"]["pages"], 3)
+        self.assertEqual(profiler.errors, [{"document": "c.pdf", "message": "cannot open"}])
+        
+    def test_merge_worker_snapshot(self):
+        worker = Profiler()
+        with worker.stage("get_text", "a.pdf"):
+            pass
+        worker.count("pages", 2, document="a.pdf")
+        
+        parent = Profiler()
+        parent.count("pages", 1, document="a.pdf")
+        parent.merge(worker.snapshot())
+        
+        self.assertEqual(parent.counters["pages"], 3)
+        self.assertEqual(parent.documents["a.pdf"]["counters"]["pages"], 3)
+        self.assertEqual(parent.stages["get_text"]["calls"], 1)
+        self.assertEqual(parent.documents["a.pdf"]["stages"]["get_text"]["calls"], 1)
+        
+    def test_report(self):
+        profiler = Profiler()
+        profiler.count("pages")
+        report = profiler.report()
+        
+        for key in ("wall_seconds", "cpu_seconds", "peak_rss_kb", "stages", "counters", "documents", "errors"):
+            self.assertIn(key, report)
+        
+        profiler.reset()
+        self.assertEqual(profiler.report()["counters"], {})
+
+if __name__ == '__main__':
+    unittest.main()
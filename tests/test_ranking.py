@@ -0,0 +1,151 @@
+import unittest
+import math
+import numpy as np
+from src.ranking import (LexicalIndex, SectionIndex, TopK, keyword_count, query_keywords, rank_key, top_k_indices,
+                         top_k_sections, TASK_KEYWORDS)
+from src.models import ExtractedSection
+
+class TestSectionIndex(unittest.TestCase):
+    def setUp(self):
+        self.titles = [
+            "Travel Tips",
+            "History",
+            "Planning Guide",
+            "Travel Planner's Notes",
+            "Local Cuisine",
+            "A Tour of the Planets"
+        ]
+        
+    def test_query_keywords(self):
+        keywords = query_keywords("Travel Planner", "Plan a trip for friends.")
+        self.assertIn("planner", keywords)
+        self.assertIn("friends.", keywords)
+        self.assertTrue(TASK_KEYWORDS <= keywords)
+        
+        words = query_keywords("Travel Planner", "Plan a trip for friends.", word_boundary=True)
+        self.assertIn("friends", words)
+        self.assertNotIn("friends.", words)
+        
+    def test_substring_counts_match_brute_force(self):
+        keywords = query_keywords("Travel Planner", "Plan a trip")
+        index = SectionIndex(self.titles)
+        
+        expected = [
+            sum(1 for keyword in keywords if keyword in title.lower())
+            for title in self.titles
+        ]
+        self.assertEqual(index.keyword_counts(keywords), expected)
+        
+    def test_word_boundary_matching(self):
+        index = SectionIndex(self.titles, word_boundary=True)
+        
+        # "plan" no longer matches "Planning", "Planner's" or "Planets"
+        self.assertEqual(index.matching("plan"), frozenset())
+        self.assertEqual(index.matching("planner"), frozenset({3}))
+        self.assertEqual(index.matching("tour"), frozenset({5}))
+        
+    def test_keyword_count_matches_index(self):
+        keywords = query_keywords("Travel Planner", "Plan a trip")
+        for word_boundary in (False, True):
+            index = SectionIndex(self.titles, word_boundary=word_boundary)
+            expected = index.keyword_counts(keywords)
+            counts = [keyword_count(title, keywords, word_boundary) for title in self.titles]
+            self.assertEqual(counts, expected)
+        
+    def test_index_reused_across_queries(self):
+        index = SectionIndex(self.titles)
+        
+        first = index.keyword_counts(query_keywords("Food Critic", "Review local cuisine"))
+        second = index.keyword_counts(query_keywords("Historian", "Study history"))
+        
+        self.assertGreater(first[4], 0)
+        self.assertGreater(second[1], 0)
+        self.assertEqual(len(first), len(self.titles))
+
+class TestTopKSections(unittest.TestCase):
+    def test_matches_full_sort(self):
+        scores = [3.5, 1.0, 3.5, 0.25, 2.0, 3.5, 1.0]
+        titles = ["B", "A", "A", "C", "D", "C", "A"]
+        sections = [
+            ExtractedSection("doc.pdf", title, score, page)
+            for page, (title, score) in enumerate(zip(titles, scores), start=1)
+        ]
+        
+        expected = sorted(sections, key=rank_key)
+        for k in range(len(sections) + 2):
+            self.assertEqual(top_k_sections(sections, k), expected[:k])
+            
+        # Equal scores and titles keep their original order
+        top = top_k_sections(sections, 5)
+        self.assertEqual([section.page_number for section in top], [3, 1, 6, 5, 2])
+        
+    def test_streaming_accumulator_matches_full_sort(self):
+        scores = [3.5, 1.0, 3.5, 0.25, 2.0, 3.5, 1.0]
+        titles = ["B", "A", "A", "C", "D", "C", "A"]
+        sections = [
+            ExtractedSection("doc.pdf", title, score, page)
+            for page, (title, score) in enumerate(zip(titles, scores), start=1)
+        ]
+        
+        expected = sorted(sections, key=rank_key)
+        for k in range(len(sections) + 2):
+            accumulator = TopK(k)
+            for section in sections:
+                accumulator.push(section)
+            self.assertEqual(accumulator.items(), expected[:k])
+
+class TestLexicalIndex(unittest.TestCase):
+    def setUp(self):
+        self.titles = ["Travel Tips", "History", "Planning Guide", "Travel Planner's Notes", "Local Cuisine", "Trip Plan"]
+        self.bodies = ["pack light for the trip", "", "plan a trip with friends", "notes", "a food tour", "plan plan plan"]
+        
+    def brute_force(self, keywords, k1=1.2, b=0.75, body_weight=0.5):
+        # Straightforward BM25F over tokenized titles and bodies
+        fields = [([t.lower().replace("'", " ").split() for t in self.titles], 1.0)]
+        if body_weight:
+            fields.append(([t.lower().split() for t in self.bodies], body_weight))
+        n = len(self.titles)
+        scores = []
+        for i in range(n):
+            score = 0.0
+            for keyword in keywords:
+                df = sum(1 for j in range(n) if any(keyword in tokens[j] for tokens, _ in fields))
+                if df == 0:
+                    continue
+                tf = 0.0
+                for tokens, weight in fields:
+                    average = sum(len(t) for t in tokens) / n
+                    tf += weight * tokens[i].count(keyword) / (1 - b + b * len(tokens[i]) / average)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1)
+            scores.append(score)
+        return scores
+        
+    def test_scores_match_brute_force(self):
+        keywords = query_keywords("Travel Planner", "Plan a trip", word_boundary=True)
+        for body_weight in (0.0, 0.5):
+            index = LexicalIndex(self.titles, self.bodies, body_weight=body_weight)
+            np.testing.assert_allclose(index.scores(keywords), self.brute_force(keywords, body_weight=body_weight))
+            
+    def test_index_reused_across_queries(self):
+        index = LexicalIndex(self.titles, self.bodies)
+        cuisine = index.scores({"cuisine"})
+        history = index.scores({"history"})
+        self.assertEqual(int(np.argmax(cuisine)), 4)
+        self.assertEqual(int(np.argmax(history)), 1)
+        self.assertEqual(index.scores({"unknown"}).tolist(), [0.0] * len(self.titles))
+        
+    def test_bodies_must_align(self):
+        with self.assertRaises(Exception):
+            LexicalIndex(self.titles, self.bodies[:-1])
+            
+    def test_top_k_indices_matches_full_sort(self):
+        scores = np.array([3.5, 1.0, 3.5, 0.25, 2.0, 3.5, 1.0])
+        titles = ["B", "A", "A", "C", "D", "C", "A"]
+        expected = sorted(range(len(titles)), key=lambda i: (-scores[i], titles[i], i))
+        for k in range(len(titles) + 2):
+            self.assertEqual(top_k_indices(scores, titles, k), expected[:k])
+        self.assertEqual(top_k_indices(scores, titles), expected)
+
+if __name__ == '__main__':
+    unittest.main()
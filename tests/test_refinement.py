@@ -0,0 +1,36 @@
+import unittest
+from src.refinement import extractive_summary, query_terms, sentence_score, split_sentences
+
+PAGE = ("Travel Tips Nice is lovely in spring. The museum opens at nine. "
+        "Plan your trip around the markets! Hotels fill up in August. • Bring sunscreen. • Book trips early.")
+
+class TestRefinement(unittest.TestCase):
+    def setUp(self):
+        self.terms = query_terms({"plan", "a", "trip", "for", "college", "friends.", "4"})
+        
+    def test_query_terms(self):
+        self.assertEqual(self.terms, {"plan", "trip", "college", "friends"})
+        
+    def test_split_sentences(self):
+        self.assertEqual(split_sentences(PAGE)[2:], [
+            "Plan your trip around the markets!", "Hotels fill up in August.", "Bring sunscreen.", "Book trips early."
+        ])
+        
+    def test_sentence_score(self):
+        # Prefix matches count: "trips" matches "trip"
+        self.assertEqual(sentence_score("Plan your trip around the markets!", self.terms), 2)
+        self.assertEqual(sentence_score("Book trips early.", self.terms), 1)
+        self.assertEqual(sentence_score("The museum opens at nine.", self.terms), 0)
+        
+    def test_extractive_summary(self):
+        # Matching sentences in page order
+        self.assertEqual(extractive_summary(PAGE, self.terms), "Plan your trip around the markets! Book trips early.")
+        # The best sentence wins when both do not fit
+        self.assertEqual(extractive_summary(PAGE, self.terms, max_chars=40), "Plan your trip around the markets!")
+        self.assertEqual(extractive_summary(PAGE, self.terms, max_chars=20), "Plan your trip")
+        # Without matches the page opening is kept
+        self.assertEqual(extractive_summary(PAGE, {"wine"}, max_chars=40), "Travel Tips Nice is lovely in spring.")
+        self.assertEqual(extractive_summary("", self.terms), "")
+
+if __name__ == '__main__':
+    unittest.main()
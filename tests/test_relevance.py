@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.models import ProcessingOptions
+from src.relevance import (RuleBasedRelevance, SpacyRelevance, create_relevance_backend, register_relevance_backend,
+                           RELEVANCE_BACKENDS, _load_ner_pipeline, _ner_components)
+
+def _listener(upstream):
+    return {"@architectures": "spacy.Tok2VecListener.v1", "width": 96, "upstream": upstream}
+
+class TestRuleBasedRelevance(unittest.TestCase):
+    def setUp(self):
+        self.backend = RuleBasedRelevance()
+        
+    def test_entities_detected(self):
+        self.assertTrue(self.backend.is_relevant("We stayed two nights in Marseille."))
+        self.assertTrue(self.backend.is_relevant("the festival starts on 14 July every year"))
+        self.assertTrue(self.backend.is_relevant("the bridge was built in 1850"))
+        self.assertTrue(self.backend.is_relevant("walk across the Pont du Gard at sunset"))
+        self.assertTrue(self.backend.is_relevant("the tour ends at Lourmarin castle"))
+        
+    def test_plain_text_not_relevant(self):
+        self.assertFalse(self.backend.is_relevant("This is a simple text without any entities."))
+        self.assertFalse(self.backend.is_relevant("Pack light.\nBring comfortable shoes.\n"))
+        self.assertEqual(list(self.backend.relevant_pages(["Paris is lovely.", "no entities here"])), [True, False])
+        
+    def test_gazetteer_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("Gordes\n\n")
+        try:
+            backend = RuleBasedRelevance.from_file(f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertIn("Gordes", backend.gazetteer)
+        self.assertIn("Paris", backend.gazetteer)
+        self.assertNotEqual(backend.version(), self.backend.version())
+        self.assertEqual(RuleBasedRelevance().version(), self.backend.version())
+
+class TestNerPipeline(unittest.TestCase):
+    def test_ner_components(self):
+        components = {
+            "tok2vec": {"factory": "tok2vec"},
+            "tagger": {"factory": "tagger", "model": {"tok2vec": _listener("tok2vec")}},
+            "ner": {"factory": "ner", "model": {"tok2vec": {"@architectures": "spacy.Tok2Vec.v2"}}}
+        }
+        # NER with its own embeddings needs nothing else
+        self.assertEqual(_ner_components({"components": components}), {"ner"})
+        
+        for upstream in ("tok2vec", "*"):
+            components["ner"]["model"]["tok2vec"] = _listener(upstream)
+            self.assertEqual(_ner_components({"components": components}), {"tok2vec", "ner"})
+        self.assertIsNone(_ner_components({"components": {"tagger": components["tagger"]}}))
+        
+    def test_unused_components_not_loaded(self):
+        import spacy
+        nlp = spacy.blank("en")
+        nlp.add_pipe("tok2vec")
+        nlp.add_pipe("tagger", config={"model": {"@architectures": "spacy.Tagger.v2", "tok2vec": _listener("tok2vec")}})
+        nlp.add_pipe("ner")
+        nlp.get_pipe("tagger").add_label("NN")
+        nlp.get_pipe("ner").add_label("GPE")
+        nlp.initialize()
+        model_dir = tempfile.mkdtemp()
+        try:
+            nlp.to_disk(model_dir)
+            loaded = _load_ner_pipeline(model_dir)
+            self.assertEqual(loaded.pipe_names, ["ner"])
+            self.assertEqual(loaded.disabled, [])
+        finally:
+            shutil.rmtree(model_dir)
+
+class TestBackendRegistry(unittest.TestCase):
+    def test_create_backends(self):
+        spacy_backend = create_relevance_backend(ProcessingOptions())
+        self.assertIsInstance(spacy_backend, SpacyRelevance)
+        # The spaCy model is only loaded on first use
+        self.assertIsNone(spacy_backend._nlp)
+        self.assertIsInstance(create_relevance_backend(ProcessingOptions(relevance_backend="rules")),
+                              RuleBasedRelevance)
+        with self.assertRaises(Exception):
+            create_relevance_backend(ProcessingOptions(relevance_backend="unknown"))
+            
+    def test_register_backend(self):
+        register_relevance_backend("everything", lambda options: RuleBasedRelevance(gazetteer=set()))
+        try:
+            backend = create_relevance_backend(ProcessingOptions(relevance_backend="everything"))
+            self.assertEqual(backend.gazetteer, set())
+        finally:
+            del RELEVANCE_BACKENDS["everything"]
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import time
+import unittest
+from src.scheduling import Deadline
+
+class TestDeadline(unittest.TestCase):
+    def test_expired(self):
+        now = [100.0]
+        deadline = Deadline(10, clock=lambda: now[0])
+        self.assertFalse(deadline.expired())
+        
+        now[0] = 106.0
+        self.assertEqual(deadline.elapsed(), 6.0)
+        self.assertTrue(deadline.expired(0.5))
+        self.assertFalse(deadline.expired())
+        
+        now[0] = 110.0
+        self.assertTrue(deadline.expired())
+        # Only the stages that stop early mark the result partial
+        self.assertFalse(deadline.partial)
+        
+    def test_wall_clock(self):
+        now = [100.0]
+        deadline = Deadline(10, clock=lambda: now[0])
+        now[0] = 104.0
+        
+        # A worker rebuilding the deadline on the wall clock sees the same time left
+        budget_seconds, start = deadline.wall_clock()
+        worker_deadline = Deadline(budget_seconds, clock=time.time, start=start)
+        self.assertAlmostEqual(worker_deadline.elapsed(), 4.0, places=1)
+
+if __name__ == '__main__':
+    unittest.main()
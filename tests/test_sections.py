@@ -0,0 +1,66 @@
+import pickle
+import unittest
+from src.models import ExtractedSection
+from src.sections import SectionTable
+
+class TestSectionTable(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ("a.pdf", 1, "Travel Tips"),
+            ("a.pdf", 2, "History"),
+            ("b.pdf", 1, ""),
+            ("b.pdf", 3, "Local Cuisine")
+        ]
+        self.table = SectionTable.from_rows(self.rows)
+        
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(list(self.table.rows()), self.rows)
+        self.assertEqual(list(self.table.titles()), [title for _, _, title in self.rows])
+        self.assertEqual(self.table.title(3), "Local Cuisine")
+        # Document names are stored once
+        self.assertEqual(self.table.documents, ["a.pdf", "b.pdf"])
+        
+    def test_materialize(self):
+        self.assertEqual(self.table.section(1, 2.5), ExtractedSection("a.pdf", "History", 2.5, 2))
+        self.assertEqual(list(self.table), [ExtractedSection(d, t, 0, p) for d, p, t in self.rows])
+        
+    def test_extend_preserves_order(self):
+        other = SectionTable.from_rows([("c.pdf", 4, "Wine Tours"), ("a.pdf", 5, "Nightlife")])
+        merged = SectionTable()
+        merged.extend(self.table)
+        merged.extend(SectionTable())
+        merged.extend(other)
+        
+        self.assertEqual(list(merged.rows()), self.rows + list(other.rows()))
+        self.assertEqual(merged.documents, ["a.pdf", "b.pdf", "c.pdf"])
+        
+    def test_take(self):
+        self.assertEqual(list(self.table.take([3, 0]).rows()), [self.rows[3], self.rows[0]])
+        
+        with_bodies = SectionTable.from_rows([("c.pdf", 4, "Wine Tours", "Vineyards"), ("c.pdf", 5, "Nightlife", "Bars")])
+        self.assertEqual(with_bodies.take([1]).bodies, ["Bars"])
+        
+    def test_bodies_column(self):
+        self.assertIsNone(self.table.bodies)
+        self.assertEqual(self.table.body(0), '')
+        
+        with_bodies = SectionTable.from_rows([("c.pdf", 4, "Wine Tours", "Visit the vineyards")])
+        merged = SectionTable()
+        merged.extend(self.table)
+        merged.extend(with_bodies)
+        merged.append("c.pdf", 5, "Nightlife")
+        
+        # Rows without a body get an empty one
+        self.assertEqual(merged.bodies, ['', '', '', '', "Visit the vineyards", ''])
+        self.assertEqual(merged.body(4), "Visit the vineyards")
+        self.assertEqual(pickle.loads(pickle.dumps(merged)).bodies, merged.bodies)
+        
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(list(copy.rows()), self.rows)
+        copy.append("d.pdf", 1, "Beaches")
+        self.assertEqual(copy.title(4), "Beaches")
+
+if __name__ == '__main__':
+    unittest.main()
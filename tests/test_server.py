@@ -0,0 +1,117 @@
+import unittest
+import os
+import json
+import signal
+import time
+import threading
+import urllib.request
+import urllib.error
+from src.server import AnalysisService, AnalysisServer
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'input')
+        cls.pdf_dir = os.path.join(data_dir, 'PDFs')
+        with open(os.path.join(data_dir, 'challenge1b_input.json'), 'r', encoding='utf-8') as f:
+            cls.payload = json.load(f)
+        
+        cls.service = AnalysisService(max_workers=2, default_pdf_dir=cls.pdf_dir)
+        cls.server = AnalysisServer(('127.0.0.1', 0), cls.service, max_pending=4)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        
+    def _request(self, path, body=None, base_url=None):
+        data = None if body is None else body.encode('utf-8')
+        request = urllib.request.Request((base_url or self.base_url) + path, data=data)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+        
+    def test_health(self):
+        status, body = self._request('/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(body["status"], "ok")
+        
+    def test_analyze(self):
+        status, body = self._request('/analyze', json.dumps(self.payload))
+        
+        self.assertEqual(status, 200)
+        self.assertEqual(body["metadata"]["persona"], "Travel Planner")
+        self.assertEqual(len(body["metadata"]["input_documents"]), 7)
+        self.assertEqual(len(body["extracted_sections"]), 5)
+        self.assertEqual(body["extracted_sections"][0]["importance_rank"], 1)
+        
+    def test_concurrent_requests_agree(self):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self._request('/analyze', json.dumps(self.payload))))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        sections = [body["extracted_sections"] for status, body in results if status == 200]
+        self.assertEqual(len(sections), 3)
+        self.assertTrue(all(s == sections[0] for s in sections))
+        
+    def test_bad_requests(self):
+        status, _ = self._request('/analyze', "not json")
+        self.assertEqual(status, 400)
+        
+        status, _ = self._request('/analyze', json.dumps({"persona": {"role": "x"}}))
+        self.assertEqual(status, 400)
+        
+        payload = dict(self.payload, documents=[{"filename": "missing.pdf", "title": "Missing"}])
+        status, _ = self._request('/analyze', json.dumps(payload))
+        self.assertEqual(status, 404)
+        
+    def test_rejects_paths_outside_pdf_dir(self):
+        payload = dict(self.payload, documents=[{"filename": "../challenge1b_input.json", "title": "Input"}])
+        status, body = self._request('/analyze', json.dumps(payload))
+        self.assertEqual(status, 400)
+        self.assertIn("outside", body["error"])
+        
+        payload = dict(self.payload, pdf_dir=os.path.dirname(self.pdf_dir))
+        status, body = self._request('/analyze', json.dumps(payload))
+        self.assertEqual(status, 400)
+        self.assertIn("not allowed", body["error"])
+        
+    def test_recovers_from_dead_worker(self):
+        service = AnalysisService(max_workers=1, default_pdf_dir=self.pdf_dir)
+        server = AnalysisServer(('127.0.0.1', 0), service, max_pending=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            for pid in list(service._executor._processes):
+                os.kill(pid, signal.SIGKILL)
+            for _ in range(50):
+                if self._request('/health', base_url=base_url)[0] == 503:
+                    break
+                time.sleep(0.1)
+            self.assertEqual(self._request('/health', base_url=base_url)[0], 503)
+            
+            # The request that finds the pool broken fails and rebuilds it
+            status, _ = self._request('/analyze', json.dumps(self.payload), base_url)
+            self.assertEqual(status, 503)
+            self.assertEqual(self._request('/health', base_url=base_url)[0], 200)
+            status, _ = self._request('/analyze', json.dumps(self.payload), base_url)
+            self.assertEqual(status, 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+        
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 import os
 import json
 from datetime import datetime
-from src.utils import save_analysis_to_json, validate_pdf_path, create_output_directory
+from src.utils import analysis_to_dict, save_analysis_to_json, validate_pdf_path, create_output_directory
 from src.models import (
     Metadata, 
     ExtractedSection, 
@@ -88,6 +88,42 @@ class TestUtils(unittest.TestCase):
         
         # Cleanup
         os.remove(output_file)
+    
+    def test_save_analysis_to_json_top_k(self):
+        metadata = Metadata(
+            input_documents=["test.pdf"],
+            persona="Test Persona",
+            job_to_be_done="Test Job",
+            processing_timestamp=datetime.now()
+        )
+        
+        analysis = DocumentAnalysis(
+            metadata=metadata,
+            extracted_sections=[
+                ExtractedSection("test.pdf", f"Section {i}", 0, i) for i in range(10)
+            ],
+            subsection_analysis=[
+                SubsectionAnalysis("test.pdf", f"Text {i}", i) for i in range(10)
+            ]
+        )
+        
+        output_file = os.path.join(self.test_output_dir, "test_output.json")
+        save_analysis_to_json(analysis, output_file, top_k=3)
+        
+        with open(output_file, 'r') as f:
+            data = json.load(f)
+        
+        self.assertEqual(len(data["extracted_sections"]), 3)
+        self.assertEqual(len(data["subsection_analysis"]), 3)
+        self.assertEqual(data["extracted_sections"][2]["importance_rank"], 3)
+        
+    def test_partial_flag(self):
+        metadata = Metadata(["test.pdf"], "Test Persona", "Test Job", datetime.now())
+        analysis = DocumentAnalysis(metadata, [], [])
+        self.assertNotIn("partial", analysis_to_dict(analysis)["metadata"])
+        
+        metadata.partial = True
+        self.assertTrue(analysis_to_dict(analysis)["metadata"]["partial"])
         
     def tearDown(self):
         # Cleanup test output directory